@@ -4,75 +4,199 @@
 只统计活动窗口的应用使用时间
 支持小时级统计（用于热力图）
 """
+import asyncio
+import bisect
 import json
+import os
 import threading
 import time
+from array import array
+from collections import defaultdict
 from pathlib import Path
 from datetime import datetime, date, timedelta
 from typing import Optional
 
 from window_tracker import get_active_window_info
 
+# JSON 编解码（优先使用 orjson，未安装时回退到标准库）
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # 数据文件
+# 每天一个文件: data/usage/YYYY-MM-DD.json
 DATA_DIR = Path(__file__).parent.parent / "data"
+USAGE_DIR = DATA_DIR / "usage"
+# 旧版单文件存储（首次运行时拆分迁移）
 USAGE_FILE = DATA_DIR / "app_usage.json"
 
 # 采样间隔（秒）
 SAMPLE_INTERVAL = 5
 
-# 全局状态
-_tracker_thread: Optional[threading.Thread] = None
-_tracker_running = False
+# 数据格式版本（v3: hours 为长度 24 的列表）
+DATA_VERSION = 3
+
+# 小时键 "00" - "23"（v2 数据中 hours 为以此为键的字典）
+_HOUR_KEYS = tuple(f"{h:02d}" for h in range(24))
 
-# 内存中的今日使用数据
-# 结构: {process_name: {"total": int, "hours": {"HH": int}}}
-_today_usage: dict[str, dict] = {}
+# 内存中的今日使用数据（连续的 int32 计数矩阵）
+# 每个进程占一行 _ROW_SIZE 个计数: 24 个小时 + 1 个总计
+# _today 为 (进程名 -> 行号, 计数矩阵)，跨天时整体替换，读取方先绑定到局部变量
+_ROW_SIZE = 25
+_TOTAL_COL = 24
+_EMPTY_ROW = array("i", [0] * _ROW_SIZE)
+_today: tuple[dict[str, int], array] = ({}, array("i"))
 _today_date: Optional[str] = None
+# 内存数据是否有尚未写入磁盘的修改
+_dirty = False
+# 下一个午夜的时间戳，到达后才重新计算日期
+_next_midnight_ts = 0.0
+# 跨天切换今日数据时加锁，避免多个线程同时刷盘和重建
+_today_lock = threading.Lock()
+
+# 已解析的每日数据缓存，按 (mtime, size) 失效
+# 结构: {date_str: ((mtime_ns, size), apps)}
+# 缓存的数据只读，需要修改时请先复制
+_cache: dict[str, tuple] = {}
+
+# 日期列表缓存，按数据目录的 mtime 失效（新增/删除每日文件时目录 mtime 会变化）
+# 结构: (mtime_ns, dates)
+_dates_cache: Optional[tuple[int, list[str]]] = None
+
+_legacy_checked = False
 
 
 def _ensure_data_dir():
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    global _legacy_checked
+    USAGE_DIR.mkdir(parents=True, exist_ok=True)
+
+    if not _legacy_checked:
+        _legacy_checked = True
+        if USAGE_FILE.exists():
+            _migrate_legacy_file()
+
 
+def _json_loads(raw: bytes):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
 
-def _load_usage() -> dict:
-    """加载使用时间数据"""
+
+def _json_dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _day_file(date_str: str) -> Path:
+    """获取指定日期的数据文件路径"""
+    return USAGE_DIR / f"{date_str}.json"
+
+
+def _load_day(date_str: str) -> dict[str, dict]:
+    """加载指定日期的使用数据（返回值只读）"""
     _ensure_data_dir()
-    if USAGE_FILE.exists():
-        try:
-            data = json.loads(USAGE_FILE.read_text(encoding="utf-8"))
-            # 迁移旧版数据格式
-            if data.get("version", 1) == 1:
-                data = _migrate_v1_to_v2(data)
-            return data
-        except (json.JSONDecodeError, IOError):
-            pass
-    return {"daily": {}, "version": 2}
+    path = _day_file(date_str)
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return {}
 
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _cache.get(date_str)
+    if cached and cached[0] == key:
+        return cached[1]
 
-def _migrate_v1_to_v2(data: dict) -> dict:
-    """将 v1 数据格式迁移到 v2（添加小时级统计）"""
-    new_data = {"daily": {}, "version": 2}
+    try:
+        data = _json_loads(path.read_bytes())
+    except (json.JSONDecodeError, IOError):
+        return {}
 
-    for date_str, apps in data.get("daily", {}).items():
-        new_data["daily"][date_str] = {}
-        for process_name, seconds in apps.items():
-            if isinstance(seconds, int):
-                # v1 格式：直接是秒数
-                new_data["daily"][date_str][process_name] = {
-                    "total": seconds,
-                    "hours": {}  # 历史数据无小时分布
-                }
-            else:
-                # 已经是 v2 格式
-                new_data["daily"][date_str][process_name] = seconds
-
-    return new_data
-
-
-def _save_usage(data: dict):
-    """保存使用时间数据"""
+    apps = data.get("apps", {})
+    if data.get("version", 2) < DATA_VERSION:
+        apps = _migrate_apps_to_v3(apps)
+
+    _cache[date_str] = (key, apps)
+    return apps
+
+
+def _atomic_write(path: Path, data: bytes):
+    """写入临时文件并落盘后原子替换目标文件，中途崩溃不会损坏原文件"""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _save_day(date_str: str, apps: dict[str, dict]):
+    """保存指定日期的使用数据"""
     _ensure_data_dir()
-    USAGE_FILE.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    _atomic_write(_day_file(date_str), _json_dumps({"version": DATA_VERSION, "apps": apps}))
+    _cache.pop(date_str, None)
+
+
+def _list_dates() -> list[str]:
+    """列出有数据文件的日期（升序，返回值只读）"""
+    global _dates_cache
+    _ensure_data_dir()
+
+    mtime_ns = USAGE_DIR.stat().st_mtime_ns
+    if _dates_cache and _dates_cache[0] == mtime_ns:
+        return _dates_cache[1]
+
+    with os.scandir(USAGE_DIR) as entries:
+        dates = sorted(
+            entry.name[:-len(".json")]
+            for entry in entries
+            if entry.is_file() and entry.name.endswith(".json")
+        )
+
+    _dates_cache = (mtime_ns, dates)
+    return dates
+
+
+def _migrate_legacy_file():
+    """将旧版单文件 app_usage.json 拆分为每日文件"""
+    try:
+        data = _json_loads(USAGE_FILE.read_bytes())
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"[USAGE] 旧数据文件读取失败，跳过迁移: {e}")
+        return
+
+    for date_str, apps in data.get("daily", {}).items():
+        # 不覆盖已存在的每日文件
+        if not _day_file(date_str).exists():
+            _save_day(date_str, _migrate_apps_to_v3(apps))
+
+    USAGE_FILE.replace(USAGE_FILE.with_suffix(".json.bak"))
+    print(f"[USAGE] 已将 {USAGE_FILE.name} 拆分为每日数据文件")
+
+
+def _migrate_apps_to_v3(apps: dict) -> dict[str, dict]:
+    """
+    将一天的应用数据迁移到 v3 格式
+
+    v1: {process_name: seconds}
+    v2: {process_name: {"total": int, "hours": {"HH": int}}}
+    v3: {process_name: {"total": int, "hours": [int] * 24}}
+    """
+    new_apps = {}
+
+    for process_name, app_data in apps.items():
+        if isinstance(app_data, int):
+            # v1 格式：直接是秒数，历史数据无小时分布
+            new_apps[process_name] = {"total": app_data, "hours": [0] * 24}
+            continue
+
+        hours = app_data.get("hours", [])
+        if isinstance(hours, dict):
+            hours = [hours.get(hour_key, 0) for hour_key in _HOUR_KEYS]
+        new_apps[process_name] = {"total": app_data.get("total", 0), "hours": list(hours)}
+
+    return new_apps
 
 
 def _get_today_str() -> str:
@@ -80,127 +204,161 @@ def _get_today_str() -> str:
     return date.today().isoformat()
 
 
-def _get_current_hour() -> str:
-    """获取当前小时字符串（00-23）"""
-    return datetime.now().strftime("%H")
+def _load_counters(apps: dict[str, dict]):
+    """用一天的应用数据重建今日计数矩阵"""
+    global _today
 
+    proc_index = {}
+    counters = array("i")
+    for process_name, app_data in apps.items():
+        proc_index[process_name] = len(proc_index)
+        counters.extend(app_data["hours"])
+        counters.append(app_data["total"])
 
-def _init_today():
-    """初始化今日数据"""
-    global _today_usage, _today_date
+    # 行号与矩阵一次性替换，读取方不会拿到不匹配的一对
+    _today = (proc_index, counters)
 
-    today = _get_today_str()
 
-    # 如果日期变了，保存昨天的数据并重新加载
-    if _today_date != today:
-        if _today_date is not None:
-            _flush_to_disk()
+def _row_of(today: tuple[dict[str, int], array], process_name: str) -> int:
+    """获取进程在计数矩阵中的起始下标，未知进程追加新行"""
+    proc_index, counters = today
+    row = proc_index.get(process_name)
+    if row is None:
+        # 先扩展矩阵再登记行号，读取方不会看到越界的行
+        counters.extend(_EMPTY_ROW)
+        row = proc_index[process_name] = len(proc_index)
+    return row * _ROW_SIZE
 
-        # 加载今日数据
-        data = _load_usage()
-        _today_usage = data.get("daily", {}).get(today, {})
-        _today_date = today
 
+def _today_app(process_name: str, today: Optional[tuple[dict[str, int], array]] = None) -> Optional[dict]:
+    """从计数矩阵中取出单个进程的今日数据"""
+    proc_index, counters = today or _today
+    row = proc_index.get(process_name)
+    if row is None:
+        return None
+    base = row * _ROW_SIZE
+    return {
+        "total": counters[base + _TOTAL_COL],
+        "hours": counters[base:base + 24].tolist(),
+    }
+
+
+def _today_apps() -> dict[str, dict]:
+    """将今日计数矩阵转换为 {process_name: {"total", "hours"}} 格式"""
+    today = _today
+    return {process_name: _today_app(process_name, today) for process_name in list(today[0])}
 
-def _flush_to_disk():
-    """将内存数据写入磁盘"""
-    global _today_usage, _today_date
 
-    if not _today_date:
+def _init_today():
+    """初始化今日数据"""
+    global _today_date, _next_midnight_ts
+
+    # 未跨过午夜时无需重新计算日期
+    if time.time() < _next_midnight_ts:
         return
 
-    data = _load_usage()
-    if "daily" not in data:
-        data["daily"] = {}
+    with _today_lock:
+        # 等锁期间其他线程可能已完成切换
+        if time.time() < _next_midnight_ts:
+            return
 
-    data["daily"][_today_date] = _today_usage
-    data["version"] = 2
-    _save_usage(data)
+        today_date = date.today()
+        today = today_date.isoformat()
 
+        # 如果日期变了，保存昨天的数据并重新加载
+        if _today_date != today:
+            if _today_date is not None:
+                _flush_to_disk()
 
-def _tracker_loop():
-    """使用时间追踪循环"""
-    global _tracker_running
+            # 加载今日数据
+            _load_counters(_load_day(today))
+            _today_date = today
 
-    print("[USAGE] 使用时间追踪器开始运行")
+        # 数据切换完成后才推进时间戳，其他线程不会提前跳过初始化
+        _next_midnight_ts = datetime.combine(today_date + timedelta(days=1), datetime.min.time()).timestamp()
 
-    last_flush = time.time()
 
-    while _tracker_running:
-        try:
-            _init_today()
+def _flush_to_disk():
+    """将内存数据写入磁盘（没有新数据时跳过）"""
+    global _dirty
 
-            # 获取当前活动窗口
-            window = get_active_window_info()
-            process_name = window.get("process_name", "")
+    if not _today_date or not _dirty:
+        return
 
-            if process_name:
-                current_hour = _get_current_hour()
+    _save_day(_today_date, _today_apps())
+    _dirty = False
 
-                # 初始化应用数据结构
-                if process_name not in _today_usage:
-                    _today_usage[process_name] = {"total": 0, "hours": {}}
 
-                app_data = _today_usage[process_name]
+def _sample(now: float):
+    """采样一次当前活动窗口并累加使用时间"""
+    global _dirty
 
-                # 累加总时间
-                app_data["total"] += SAMPLE_INTERVAL
+    _init_today()
 
-                # 累加小时时间
-                if current_hour not in app_data["hours"]:
-                    app_data["hours"][current_hour] = 0
-                app_data["hours"][current_hour] += SAMPLE_INTERVAL
+    # 获取当前活动窗口
+    window = get_active_window_info()
+    process_name = window.get("process_name", "")
 
-            # 每 60 秒写入磁盘一次
-            if time.time() - last_flush >= 60:
-                _flush_to_disk()
-                last_flush = time.time()
+    if process_name:
+        current_hour = time.localtime(now).tm_hour
 
-        except Exception as e:
-            print(f"[USAGE] 追踪出错: {e}")
+        # 累加总时间和小时时间
+        today = _today
+        counters = today[1]
+        base = _row_of(today, process_name)
+        counters[base + current_hour] += SAMPLE_INTERVAL
+        counters[base + _TOTAL_COL] += SAMPLE_INTERVAL
+        _dirty = True
 
-        time.sleep(SAMPLE_INTERVAL)
 
-    # 退出时保存
-    _flush_to_disk()
-    print("[USAGE] 使用时间追踪器已停止")
+async def tracker_loop():
+    """
+    使用时间追踪协程
 
+    运行在 FastAPI 的事件循环上，窗口查询和磁盘写入放到线程池执行；
+    任务被取消时保存数据后退出
+    """
+    print("[USAGE] 使用时间追踪器开始运行")
 
-def start_tracker():
-    """启动使用时间追踪器"""
-    global _tracker_thread, _tracker_running
+    last_flush = time.time()
 
-    if _tracker_running:
-        return
+    try:
+        while True:
+            try:
+                now = time.time()
+                await asyncio.to_thread(_sample, now)
 
-    _tracker_running = True
-    _tracker_thread = threading.Thread(target=_tracker_loop, daemon=True)
-    _tracker_thread.start()
-    print("[USAGE] 使用时间追踪器已启动")
+                # 每 60 秒写入磁盘一次
+                if now - last_flush >= 60:
+                    await asyncio.to_thread(_flush_to_disk)
+                    last_flush = now
 
+            except Exception as e:
+                print(f"[USAGE] 追踪出错: {e}")
 
-def stop_tracker():
-    """停止使用时间追踪器"""
-    global _tracker_running
-    _tracker_running = False
+            await asyncio.sleep(SAMPLE_INTERVAL)
+    finally:
+        # 退出时保存
+        _flush_to_disk()
+        print("[USAGE] 使用时间追踪器已停止")
 
 
 def get_today_usage() -> dict[str, int]:
     """获取今日使用时间（秒）- 兼容旧接口"""
     _init_today()
-    result = {}
-    for process_name, data in _today_usage.items():
-        if isinstance(data, dict):
-            result[process_name] = data.get("total", 0)
-        else:
-            result[process_name] = data  # v1 兼容
-    return result
+    proc_index, counters = _today
+    return dict(zip(list(proc_index), counters[_TOTAL_COL::_ROW_SIZE].tolist()))
 
 
 def get_today_usage_detail() -> dict[str, dict]:
     """获取今日使用时间详情（含小时分布）"""
     _init_today()
-    return dict(_today_usage)
+    return _today_apps()
+
+
+def _day_totals(date_str: str) -> dict[str, int]:
+    """获取历史日期各应用的总时间（不处理今天）"""
+    return {process_name: app_data["total"] for process_name, app_data in _load_day(date_str).items()}
 
 
 def get_usage_by_date(date_str: str) -> dict[str, int]:
@@ -208,16 +366,7 @@ def get_usage_by_date(date_str: str) -> dict[str, int]:
     if date_str == _get_today_str():
         return get_today_usage()
 
-    data = _load_usage()
-    day_data = data.get("daily", {}).get(date_str, {})
-
-    result = {}
-    for process_name, app_data in day_data.items():
-        if isinstance(app_data, dict):
-            result[process_name] = app_data.get("total", 0)
-        else:
-            result[process_name] = app_data  # v1 兼容
-    return result
+    return _day_totals(date_str)
 
 
 def get_usage_by_date_detail(date_str: str) -> dict[str, dict]:
@@ -225,63 +374,62 @@ def get_usage_by_date_detail(date_str: str) -> dict[str, dict]:
     if date_str == _get_today_str():
         return get_today_usage_detail()
 
-    data = _load_usage()
-    day_data = data.get("daily", {}).get(date_str, {})
-
-    # 确保格式统一
-    result = {}
-    for process_name, app_data in day_data.items():
-        if isinstance(app_data, dict):
-            result[process_name] = app_data
-        else:
-            result[process_name] = {"total": app_data, "hours": {}}
-    return result
+    return dict(_load_day(date_str))
 
 
 def get_usage_range(start_date: str, end_date: str) -> dict[str, dict[str, int]]:
     """获取日期范围内的使用时间"""
-    data = _load_usage()
-    daily = data.get("daily", {})
+    today = _get_today_str()
+
+    # 日期列表已排序，二分定位范围
+    dates = _list_dates()
+    lo = bisect.bisect_left(dates, start_date)
+    hi = bisect.bisect_right(dates, end_date)
 
     result = {}
-    for date_str in daily:
-        if start_date <= date_str <= end_date:
-            result[date_str] = get_usage_by_date(date_str)
+    for date_str in dates[lo:hi]:
+        if date_str != today:
+            result[date_str] = _day_totals(date_str)
 
     # 如果包含今天，使用内存中的数据
-    today = _get_today_str()
     if start_date <= today <= end_date:
         result[today] = get_today_usage()
 
     return result
 
 
-def get_week_summary() -> dict:
-    """获取最近 7 天的使用统计摘要"""
-    today = date.today()
-    dates = [(today - timedelta(days=i)).isoformat() for i in range(6, -1, -1)]
+def _summarize_dates(dates: list[str]) -> tuple[list[dict], dict[str, int]]:
+    """汇总日期列表内每天的总时间和每个应用的总时间（每天的数据只读取一次）"""
+    today = _get_today_str()
+    today_usage = get_today_usage()
 
     daily_totals = []
-    all_apps = set()
+    app_totals = defaultdict(int)
 
     for date_str in dates:
-        usage = get_usage_by_date(date_str)
-        total = sum(usage.values())
+        # 今天直接使用内存中的数据
+        usage = today_usage if date_str == today else _day_totals(date_str)
+        total = 0
+        for process_name, seconds in usage.items():
+            total += seconds
+            app_totals[process_name] += seconds
         daily_totals.append({
             "date": date_str,
             "total": total,
             "formatted": format_duration(total),
         })
-        all_apps.update(usage.keys())
 
-    # 计算每个应用的周总计
-    app_totals = {}
-    for process_name in all_apps:
-        total = 0
-        for date_str in dates:
-            usage = get_usage_by_date(date_str)
-            total += usage.get(process_name, 0)
-        app_totals[process_name] = total
+    return daily_totals, app_totals
+
+
+def get_week_summary() -> dict:
+    """获取最近 7 天的使用统计摘要"""
+    today = date.today()
+    dates = [(today - timedelta(days=i)).isoformat() for i in range(6, -1, -1)]
+
+    daily_totals, app_totals = _summarize_dates(dates)
+
+    week_total = sum(d["total"] for d in daily_totals)
 
     # 排序应用
     sorted_apps = sorted(app_totals.items(), key=lambda x: -x[1])
@@ -297,8 +445,8 @@ def get_week_summary() -> dict:
             }
             for name, total in sorted_apps
         ],
-        "week_total": sum(d["total"] for d in daily_totals),
-        "week_total_formatted": format_duration(sum(d["total"] for d in daily_totals)),
+        "week_total": week_total,
+        "week_total_formatted": format_duration(week_total),
     }
 
 
@@ -307,27 +455,9 @@ def get_month_summary() -> dict:
     today = date.today()
     dates = [(today - timedelta(days=i)).isoformat() for i in range(29, -1, -1)]
 
-    daily_totals = []
-    all_apps = set()
-
-    for date_str in dates:
-        usage = get_usage_by_date(date_str)
-        total = sum(usage.values())
-        daily_totals.append({
-            "date": date_str,
-            "total": total,
-            "formatted": format_duration(total),
-        })
-        all_apps.update(usage.keys())
+    daily_totals, app_totals = _summarize_dates(dates)
 
-    # 计算每个应用的月总计
-    app_totals = {}
-    for process_name in all_apps:
-        total = 0
-        for date_str in dates:
-            usage = get_usage_by_date(date_str)
-            total += usage.get(process_name, 0)
-        app_totals[process_name] = total
+    month_total = sum(d["total"] for d in daily_totals)
 
     # 排序应用
     sorted_apps = sorted(app_totals.items(), key=lambda x: -x[1])
@@ -343,8 +473,8 @@ def get_month_summary() -> dict:
             }
             for name, total in sorted_apps
         ],
-        "month_total": sum(d["total"] for d in daily_totals),
-        "month_total_formatted": format_duration(sum(d["total"] for d in daily_totals)),
+        "month_total": month_total,
+        "month_total_formatted": format_duration(month_total),
     }
 
 
@@ -353,29 +483,26 @@ def get_app_detail(process_name: str, days: int = 30) -> dict:
     today = date.today()
     dates = [(today - timedelta(days=i)).isoformat() for i in range(days - 1, -1, -1)]
 
-    # 构建热力图数据：每天每小时的使用时间
-    heatmap = []  # [{date, hour, seconds}]
+    # 构建热力图数据：每天一行，每行 24 个小时的使用时间
+    heatmap_values = []
     daily_data = []
 
-    for date_str in dates:
-        detail = get_usage_by_date_detail(date_str)
-        app_data = detail.get(process_name, {"total": 0, "hours": {}})
+    _init_today()
+    today_str = _get_today_str()
 
+    for date_str in dates:
+        if date_str == today_str:
+            app_data = _today_app(process_name)
+        else:
+            app_data = _load_day(date_str).get(process_name)
+        app_total = app_data["total"] if app_data else 0
         daily_data.append({
             "date": date_str,
-            "total": app_data.get("total", 0),
-            "formatted": format_duration(app_data.get("total", 0)),
+            "total": app_total,
+            "formatted": format_duration(app_total),
         })
 
-        hours = app_data.get("hours", {})
-        for hour in range(24):
-            hour_str = f"{hour:02d}"
-            seconds = hours.get(hour_str, 0)
-            heatmap.append({
-                "date": date_str,
-                "hour": hour,
-                "seconds": seconds,
-            })
+        heatmap_values.append(list(app_data["hours"]) if app_data else [0] * 24)
 
     total = sum(d["total"] for d in daily_data)
 
@@ -384,7 +511,7 @@ def get_app_detail(process_name: str, days: int = 30) -> dict:
         "days": days,
         "dates": dates,
         "daily": daily_data,
-        "heatmap": heatmap,
+        "heatmap": {"dates": dates, "values": heatmap_values},
         "total": total,
         "total_formatted": format_duration(total),
     }
@@ -393,10 +520,9 @@ def get_app_detail(process_name: str, days: int = 30) -> dict:
 def get_app_usage_today(process_name: str) -> int:
     """获取指定应用今日使用时间（秒）"""
     _init_today()
-    app_data = _today_usage.get(process_name, {})
-    if isinstance(app_data, dict):
-        return app_data.get("total", 0)
-    return app_data
+    proc_index, counters = _today
+    row = proc_index.get(process_name)
+    return counters[row * _ROW_SIZE + _TOTAL_COL] if row is not None else 0
 
 
 def format_duration(seconds: int) -> str:
@@ -416,30 +542,34 @@ def format_duration(seconds: int) -> str:
 
 def get_available_dates() -> list[str]:
     """获取有数据的日期列表"""
-    data = _load_usage()
-    dates = list(data.get("daily", {}).keys())
+    dates = _list_dates()
 
-    # 添加今天
+    # 添加今天（缓存的列表只读，复制后再修改）
     today = _get_today_str()
-    if today not in dates and _today_usage:
-        dates.append(today)
+    if today not in dates and _today[0]:
+        dates = [*dates, today]
+        dates.sort()
 
-    dates.sort(reverse=True)
-    return dates
+    return dates[::-1]
 
 
 if __name__ == "__main__":
     # 测试
-    print("启动使用时间追踪测试...")
-    start_tracker()
+    async def _main():
+        print("启动使用时间追踪测试...")
+        tracker = asyncio.create_task(tracker_loop())
+        try:
+            while True:
+                await asyncio.sleep(10)
+                usage = get_today_usage()
+                print(f"\n今日使用时间:")
+                for app, seconds in sorted(usage.items(), key=lambda x: -x[1])[:5]:
+                    print(f"  {app}: {format_duration(seconds)}")
+        finally:
+            tracker.cancel()
+            await asyncio.gather(tracker, return_exceptions=True)
 
     try:
-        while True:
-            time.sleep(10)
-            usage = get_today_usage()
-            print(f"\n今日使用时间:")
-            for app, seconds in sorted(usage.items(), key=lambda x: -x[1])[:5]:
-                print(f"  {app}: {format_duration(seconds)}")
+        asyncio.run(_main())
     except KeyboardInterrupt:
-        stop_tracker()
         print("\n已停止")
@@ -3,8 +3,10 @@ TOTP 两步验证模块
 """
 import secrets
 import hashlib
+import time
+from functools import lru_cache
 from pathlib import Path
-from datetime import datetime, timedelta
+from typing import Optional
 
 import pyotp
 import qrcode
@@ -28,8 +30,15 @@ def _get_token_valid_days() -> int:
 TOKEN_VALID_DAYS = 7  # 默认值，实际使用 _get_token_valid_days()
 
 # 已验证设备的 token 存储（内存中，重启后失效需重新验证）
-# 格式: {token_hash: expire_time}
-_verified_tokens: dict[str, datetime] = {}
+# 格式: {token_hash: expire_ts}，过期时间为 time.time() 时间戳，校验时只需一次浮点比较
+_verified_tokens: dict[str, float] = {}
+
+# 每注册多少个 token 清理一次过期 token（避免从不再访问的设备 token 一直占用内存）
+SWEEP_EVERY = 64
+_inserts_since_sweep = 0
+
+# TOTP 实例缓存（密钥运行期间不会变化）
+_cached_totp: Optional[pyotp.TOTP] = None
 
 
 def _ensure_config_dir():
@@ -61,12 +70,18 @@ def get_or_create_secret() -> str:
     return secret
 
 
+def _get_totp() -> pyotp.TOTP:
+    """获取 TOTP 实例（首次调用时读取密钥）"""
+    global _cached_totp
+    if _cached_totp is None:
+        _cached_totp = pyotp.TOTP(get_or_create_secret())
+    return _cached_totp
+
+
 def verify_totp(code: str) -> bool:
     """验证 TOTP 码"""
-    secret = get_or_create_secret()
-    totp = pyotp.TOTP(secret)
     # valid_window=1 允许前后 30 秒的误差
-    return totp.verify(code, valid_window=1)
+    return _get_totp().verify(code, valid_window=1)
 
 
 def generate_device_token() -> str:
@@ -74,16 +89,31 @@ def generate_device_token() -> str:
     return secrets.token_urlsafe(32)
 
 
+@lru_cache(maxsize=1024)
 def hash_token(token: str) -> str:
-    """对 token 进行哈希"""
+    """对 token 进行哈希（结果缓存，轮询请求不必重复计算 SHA-256）"""
     return hashlib.sha256(token.encode()).hexdigest()
 
 
+def _sweep_expired_tokens():
+    """清理所有过期 token（在线程池中运行，可能与事件循环上的 is_token_valid 同时修改字典）"""
+    now = time.time()
+    expired = [h for h, expire_ts in list(_verified_tokens.items()) if expire_ts <= now]
+    for token_hash in expired:
+        _verified_tokens.pop(token_hash, None)
+
+
 def register_verified_token(token: str):
     """注册已验证的 token"""
+    global _inserts_since_sweep
+
     token_hash = hash_token(token)
-    expire_time = datetime.now() + timedelta(days=_get_token_valid_days())
-    _verified_tokens[token_hash] = expire_time
+    _verified_tokens[token_hash] = time.time() + _get_token_valid_days() * 86400
+
+    _inserts_since_sweep += 1
+    if _inserts_since_sweep >= SWEEP_EVERY:
+        _sweep_expired_tokens()
+        _inserts_since_sweep = 0
 
 
 def is_token_valid(token: str) -> bool:
@@ -92,14 +122,14 @@ def is_token_valid(token: str) -> bool:
         return False
 
     token_hash = hash_token(token)
-    expire_time = _verified_tokens.get(token_hash)
+    expire_ts = _verified_tokens.get(token_hash)
 
-    if not expire_time:
+    if not expire_ts:
         return False
 
-    if datetime.now() > expire_time:
-        # 过期，删除
-        del _verified_tokens[token_hash]
+    if time.time() > expire_ts:
+        # 过期，删除（可能已被清理线程删除）
+        _verified_tokens.pop(token_hash, None)
         return False
 
     return True
@@ -111,13 +141,13 @@ def get_token_expire_days(token: str) -> int:
         return 0
 
     token_hash = hash_token(token)
-    expire_time = _verified_tokens.get(token_hash)
+    expire_ts = _verified_tokens.get(token_hash)
 
-    if not expire_time:
+    if not expire_ts:
         return 0
 
-    remaining = expire_time - datetime.now()
-    return max(0, remaining.days)
+    remaining_days = (expire_ts - time.time()) // 86400
+    return max(0, int(remaining_days))
 
 
 # 启动时确保密钥存在
@@ -14,10 +14,23 @@ CONFIG_FILE = CONFIG_DIR / "config.yaml"
 # 全局配置对象
 _config: Optional[dict] = None
 
+# 按点号路径展开的配置 {"server.port": 8000, "server": {...}, ...}
+# 中间层级的 dict 也会保留，便于读取整段配置
+_flat: Optional[dict[str, Any]] = None
+
+
+def _flatten(d: dict, prefix: str, out: dict):
+    """将嵌套配置展开为点号路径"""
+    for k, v in d.items():
+        path = f"{prefix}{k}"
+        out[path] = v
+        if isinstance(v, dict):
+            _flatten(v, f"{path}.", out)
+
 
 def _load_config() -> dict:
     """加载配置文件"""
-    global _config
+    global _config, _flat
     if _config is not None:
         return _config
 
@@ -25,7 +38,12 @@ def _load_config() -> dict:
         raise FileNotFoundError(f"配置文件不存在: {CONFIG_FILE}")
 
     with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-        _config = yaml.safe_load(f)
+        config = yaml.safe_load(f) or {}
+
+    flat = {}
+    _flatten(config, "", flat)
+    _flat = flat
+    _config = config
 
     return _config
 
@@ -38,23 +56,16 @@ def get(key: str, default: Any = None) -> Any:
         get("server.port")  # 返回 8000
         get("qq_notify.targets.私人.id")  # 返回 1608900366
     """
-    config = _load_config()
-    keys = key.split(".")
-    value = config
-
-    for k in keys:
-        if isinstance(value, dict) and k in value:
-            value = value[k]
-        else:
-            return default
-
-    return value
+    if _flat is None:
+        _load_config()
+    return _flat.get(key, default)
 
 
 def reload():
     """重新加载配置文件"""
-    global _config
+    global _config, _flat
     _config = None
+    _flat = None
     _load_config()
 
 
@@ -119,9 +130,17 @@ class QQNotifyConfig:
         return get("qq_notify.targets", {})
 
 
+class DebugConfig:
+    """调试配置"""
+    @property
+    def profiling(self) -> bool:
+        return get("debug.profiling", False)
+
+
 # 配置实例
 server = ServerConfig()
 auth = AuthConfig()
 mobile_device = MobileDeviceConfig()
 reminder = ReminderConfig()
 qq_notify = QQNotifyConfig()
+debug = DebugConfig()
@@ -1,13 +1,34 @@
 """
 设备信息采集（CPU、内存、磁盘、运行时间）
 """
-import psutil
+import re
 import time
 
+import psutil
+
 
 # 系统启动时间（秒级时间戳）
 _boot_time = psutil.boot_time()
 
+# 字节换算常量
+_GB = 1 << 30
+# 超过此容量的分区视为异常（如虚拟文件系统）
+_MAX_DISK_BYTES = 100 * (1 << 40)  # 100 TB
+
+# 标准盘符挂载点（如 C:\, D:\）
+_MOUNT_RE = re.compile(r"^[A-Z]:\\$")
+
+# 分区列表缓存时间（秒），分区很少变化，不必每次轮询都枚举
+PARTITIONS_TTL = 60
+
+# 分区缓存: [(device, mountpoint, fstype)]
+_parts_cache = {"ts": float("-inf"), "parts": []}
+
+# 设备信息快照缓存时间（秒），多个客户端高频轮询时共用同一份快照
+DEVICE_TTL = 1.0
+
+_device_cache = {"ts": float("-inf"), "data": None}
+
 
 def get_device_info() -> dict:
     """
@@ -22,15 +43,21 @@ def get_device_info() -> dict:
             "uptime_seconds": 3600,
             "disks": [...]
         }
+
+    返回值在 DEVICE_TTL 内会被复用，调用方不应修改
     """
+    now = time.monotonic()
+    if _device_cache["data"] is not None and now - _device_cache["ts"] < DEVICE_TTL:
+        return _device_cache["data"]
+
     # CPU 使用率（非阻塞，取上次调用间隔的平均值）
     cpu_percent = psutil.cpu_percent(interval=None)
 
     # 内存信息
     mem = psutil.virtual_memory()
     memory_percent = mem.percent
-    memory_used_gb = round(mem.used / (1024**3), 1)
-    memory_total_gb = round(mem.total / (1024**3), 1)
+    memory_used_gb = round(mem.used / _GB, 1)
+    memory_total_gb = round(mem.total / _GB, 1)
 
     # 运行时间
     uptime_seconds = int(time.time() - _boot_time)
@@ -38,7 +65,7 @@ def get_device_info() -> dict:
     # 磁盘信息
     disks = get_disk_info()
 
-    return {
+    data = {
         "cpu_percent": cpu_percent,
         "memory_percent": memory_percent,
         "memory_used_gb": memory_used_gb,
@@ -47,6 +74,41 @@ def get_device_info() -> dict:
         "disks": disks,
     }
 
+    _device_cache["ts"] = now
+    _device_cache["data"] = data
+    return data
+
+
+def _get_partitions() -> list:
+    """获取有效的磁盘分区列表（带缓存）"""
+    now = time.monotonic()
+    if now - _parts_cache["ts"] < PARTITIONS_TTL:
+        return _parts_cache["parts"]
+
+    parts = []
+    seen_devices = set()
+
+    for partition in psutil.disk_partitions():
+        # 跳过光驱和无文件系统的分区
+        if "cdrom" in partition.opts or partition.fstype == "":
+            continue
+
+        # 只保留标准盘符挂载点
+        if not _MOUNT_RE.match(partition.mountpoint):
+            continue
+
+        # 去重（同一盘符可能有多个挂载点）
+        device = partition.device.rstrip("\\")
+        if device in seen_devices:
+            continue
+        seen_devices.add(device)
+
+        parts.append((device, partition.mountpoint, partition.fstype))
+
+    _parts_cache["ts"] = now
+    _parts_cache["parts"] = parts
+    return parts
+
 
 def get_disk_info() -> list:
     """
@@ -66,39 +128,22 @@ def get_disk_info() -> list:
             ...
         ]
     """
-    import re
-
     disks = []
-    seen_devices = set()
-
-    for partition in psutil.disk_partitions():
-        # 跳过光驱和无文件系统的分区
-        if "cdrom" in partition.opts or partition.fstype == "":
-            continue
-
-        # 只保留标准盘符挂载点（如 C:\, D:\）
-        if not re.match(r"^[A-Z]:\\$", partition.mountpoint):
-            continue
-
-        # 去重（同一盘符可能有多个挂载点）
-        device = partition.device.rstrip("\\")
-        if device in seen_devices:
-            continue
-        seen_devices.add(device)
 
+    for device, mountpoint, fstype in _get_partitions():
         try:
-            usage = psutil.disk_usage(partition.mountpoint)
+            usage = psutil.disk_usage(mountpoint)
             # 跳过容量异常的分区（如虚拟文件系统）
-            if usage.total > 1024 * 1024 * 1024 * 1024 * 100:  # > 100 TB
+            if usage.total > _MAX_DISK_BYTES:
                 continue
 
             disks.append({
                 "device": device,
-                "mountpoint": partition.mountpoint,
-                "fstype": partition.fstype,
-                "total_gb": round(usage.total / (1024**3), 1),
-                "used_gb": round(usage.used / (1024**3), 1),
-                "free_gb": round(usage.free / (1024**3), 1),
+                "mountpoint": mountpoint,
+                "fstype": fstype,
+                "total_gb": round(usage.total / _GB, 1),
+                "used_gb": round(usage.used / _GB, 1),
+                "free_gb": round(usage.free / _GB, 1),
                 "percent": usage.percent,
             })
         except (PermissionError, OSError):
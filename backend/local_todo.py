@@ -1,15 +1,28 @@
 """
 本地 TODO 系统
+
+数据存储在 SQLite (data/todos.sqlite, WAL 模式)，读取走内存快照
 """
+import heapq
 import json
+import operator
+import queue
+import sqlite3
 import uuid
 import threading
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Optional, List
 
 import config
 
+# JSON 编解码（优先使用 orjson，未安装时回退到标准库）
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Windows 通知 (优先使用 winotify，备选 win10toast)
 NOTIFY_BACKEND = None
 try:
@@ -24,51 +37,287 @@ except ImportError:
 
 # 数据文件
 DATA_DIR = Path(__file__).parent.parent / "data"
+DB_FILE = DATA_DIR / "todos.sqlite"
+# 初始数据（首次创建数据库时导入，文件本身不会被修改）
 TODOS_FILE = DATA_DIR / "todos.json"
 
+# 表结构，列顺序与 _todo_to_row / _row_to_todo 一致
+# remind 存 JSON 文本；completed_at / remind_at / reminded 为可选字段，NULL 时不出现在 TODO dict 中
+_COLUMNS = (
+    "id", "title", "notes", "completed", "important", "parent_id",
+    "remind", "remind_tag", "last_reminded_at", "created_at", "updated_at",
+    "completed_at", "remind_at", "reminded",
+)
+_OPTIONAL_FIELDS = ("completed_at", "remind_at", "reminded")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS todos (
+    id TEXT PRIMARY KEY,
+    title TEXT,
+    notes TEXT,
+    completed INTEGER NOT NULL DEFAULT 0,
+    important INTEGER NOT NULL DEFAULT 0,
+    parent_id TEXT,
+    remind TEXT,
+    remind_tag TEXT,
+    last_reminded_at TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    completed_at TEXT,
+    remind_at TEXT,
+    reminded INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_todos_order ON todos (completed, important, created_at);
+CREATE INDEX IF NOT EXISTS idx_todos_parent ON todos (parent_id);
+"""
+
+_SELECT_SQL = f"SELECT {', '.join(_COLUMNS)} FROM todos ORDER BY rowid"
+# 按 id 更新时保留 rowid，列表顺序不变
+_UPSERT_SQL = (
+    f"INSERT INTO todos ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))}) "
+    f"ON CONFLICT(id) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in _COLUMNS[1:])}"
+)
+# 任务及其所有子孙任务的 id
+_SUBTREE_SQL = """
+WITH RECURSIVE subtree(id) AS (
+    SELECT id FROM todos WHERE id = ?
+    UNION
+    SELECT todos.id FROM todos JOIN subtree ON todos.parent_id = subtree.id
+)
+SELECT id FROM subtree
+"""
+
+# 数据库连接（首次使用时打开，访问需持有 _lock）
+_conn: Optional[sqlite3.Connection] = None
+
+# 数据库内容的内存快照，按 PRAGMA data_version 失效（MCP Server 进程也会写数据库）
+# 快照整体只读，修改时构造新快照后替换 _snapshot 引用，读取方拿到的始终是完整一致的一版：
+# 写入方持有 _lock，复制要改的 todo 并构造新的 todos tuple，连同变化的行交给 _write_todos
+# todos: 全部 TODO (tuple)
+# by_id: {todo_id: todo}，与 todos 中的对象相同
+# all_sorted / active_sorted: 按 (重要优先, 创建时间) 排好序的全部 / 未完成列表
+# compiled: {todo_id: _compile_remind(todo["remind"])}，只含设置了 remind 的任务
+# remindable_ids: 未完成且设置了提醒（含旧格式 remind_at）的任务 id，按原顺序
+# gen: 每次替换快照时递增，提醒线程据此判断是否需要重建触发时间堆
+_snapshot: dict = {
+    "key": None, "todos": (), "by_id": {}, "all_sorted": (), "active_sorted": (),
+    "compiled": {}, "remindable_ids": (), "gen": 0,
+}
+# 写锁：串行化数据库访问和快照替换，读取快照不需要等待
+_lock = threading.RLock()
+
+# 本次运行的标识，与快照 gen 组成数据版本号（进程重启后 gen 从头计数）
+_RUN_ID = uuid.uuid4().hex[:8]
+
+# 数据变化时唤醒提醒线程，重新计算下次触发时间
+_reminder_wakeup = threading.Event()
+
 
 def _ensure_data_dir():
     DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def _load_todos() -> dict:
-    """加载 TODO 数据"""
-    _ensure_data_dir()
-    if TODOS_FILE.exists():
+def _json_loads(raw: bytes):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
+def _json_dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _todo_to_row(todo: dict) -> tuple:
+    remind = todo.get("remind")
+    reminded = todo.get("reminded")
+    return (
+        todo["id"],
+        todo.get("title"),
+        todo.get("notes", ""),
+        bool(todo.get("completed")),
+        bool(todo.get("important")),
+        todo.get("parent_id"),
+        _json_dumps(remind).decode("utf-8") if remind is not None else None,
+        todo.get("remind_tag"),
+        todo.get("last_reminded_at"),
+        todo.get("created_at", ""),
+        todo.get("updated_at"),
+        todo.get("completed_at"),
+        todo.get("remind_at"),
+        bool(reminded) if reminded is not None else None,
+    )
+
+
+def _row_to_todo(row: tuple) -> dict:
+    todo = dict(zip(_COLUMNS, row))
+    todo["completed"] = bool(todo["completed"])
+    todo["important"] = bool(todo["important"])
+    if todo["remind"] is not None:
+        todo["remind"] = _json_loads(todo["remind"].encode("utf-8"))
+    for field in _OPTIONAL_FIELDS:
+        if todo[field] is None:
+            del todo[field]
+    if "reminded" in todo:
+        todo["reminded"] = bool(todo["reminded"])
+    return todo
+
+
+def _get_conn() -> sqlite3.Connection:
+    """获取数据库连接，首次调用时建表并导入旧版 todos.json（调用方需持有 _lock）"""
+    global _conn
+    if _conn is None:
+        _ensure_data_dir()
+        conn = sqlite3.connect(DB_FILE, timeout=10, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        _migrate_legacy_file(conn)
+        _conn = conn
+    return _conn
+
+
+# 旧数据没有 remind_tag 字段时使用的提醒目标
+DEFAULT_REMIND_TAG = "私人"
+
+# 导入旧版 todos.json 后设置的 PRAGMA user_version，之后不再导入
+# todos.json 保持原样（仓库中的初始数据文件），不会被重命名或修改
+_MIGRATED_VERSION = 1
+
+
+def _migrate_legacy_file(conn: sqlite3.Connection):
+    """数据库首次创建时导入 todos.json（只导入一次）"""
+    # 立即获取写锁，避免主服务和 MCP Server 同时导入
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if conn.execute("PRAGMA user_version").fetchone()[0] < _MIGRATED_VERSION:
+            empty = conn.execute("SELECT 1 FROM todos LIMIT 1").fetchone() is None
+            if empty and TODOS_FILE.exists():
+                _import_legacy_todos(conn)
+            conn.execute(f"PRAGMA user_version = {_MIGRATED_VERSION}")
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
+def _import_legacy_todos(conn: sqlite3.Connection):
+    """将 todos.json 中的任务写入数据库（调用方负责提交）"""
+    try:
+        data = _json_loads(TODOS_FILE.read_bytes())
+    except (ValueError, IOError) as e:
+        print(f"[TODO] 旧数据文件读取失败，跳过导入: {e}")
+        return
+    todos = data.get("todos", []) if isinstance(data, dict) else []
+    todos = [t for t in todos if isinstance(t, dict) and t.get("id")]
+    # 旧数据缺少 remind_tag 时按原来的默认值发送到 "私人"（数据库中缺失即为 NULL，无法再区分）
+    todos = [t if "remind_tag" in t else dict(t, remind_tag=DEFAULT_REMIND_TAG) for t in todos]
+    conn.executemany(_UPSERT_SQL, [_todo_to_row(t) for t in todos])
+    print(f"[TODO] 已从 {TODOS_FILE.name} 导入 {len(todos)} 个任务")
+
+
+def _db_version(conn: sqlite3.Connection) -> int:
+    """其它连接（进程）提交修改后会变化的版本号"""
+    return conn.execute("PRAGMA data_version").fetchone()[0]
+
+
+_by_created_at = operator.itemgetter("created_at")
+_by_important = operator.itemgetter("important")
+
+
+def _publish(key: Optional[int], todos: tuple):
+    """由 todos 构造新快照（id 索引、排序列表等）并替换当前快照（调用方需持有 _lock）"""
+    global _snapshot
+    for t in todos:
+        # 统一字段类型，排序时可直接取值
+        t["important"] = bool(t.get("important", False))
+        t.setdefault("created_at", "")
+
+    # 稳定排序两次：先按创建时间，再把重要的排到前面
+    all_sorted = sorted(todos, key=_by_created_at)
+    all_sorted.sort(key=_by_important, reverse=True)
+    all_sorted = tuple(all_sorted)
+
+    _snapshot = {
+        "key": key,
+        "todos": todos,
+        "by_id": {t["id"]: t for t in todos},
+        "all_sorted": all_sorted,
+        "active_sorted": tuple(t for t in all_sorted if not t.get("completed")),
+        "compiled": {t["id"]: _compile_remind(t["remind"]) for t in todos if t.get("remind")},
+        "remindable_ids": tuple(
+            t["id"] for t in todos
+            if not t.get("completed") and (t.get("remind") or (t.get("remind_at") and not t.get("reminded")))
+        ),
+        "gen": _snapshot["gen"] + 1,
+    }
+
+
+def _refresh() -> dict:
+    """数据库被其它进程修改过时重新加载，返回最新快照（调用方需持有 _lock）"""
+    conn = _get_conn()
+    key = _db_version(conn)
+    if _snapshot["key"] != key:
+        _publish(key, tuple(map(_row_to_todo, conn.execute(_SELECT_SQL))))
+    return _snapshot
+
+
+def _load_snapshot() -> dict:
+    """
+    获取当前快照
+
+    写锁空闲时顺带检查数据库是否被其它进程修改；
+    正在写入时不等待，直接返回上一版快照（首次加载除外）
+    """
+    if _lock.acquire(blocking=False):
         try:
-            return json.loads(TODOS_FILE.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, IOError):
-            pass
-    return {"todos": [], "version": 1}
+            return _refresh()
+        finally:
+            _lock.release()
+    if _snapshot["key"] is None:
+        with _lock:
+            return _refresh()
+    return _snapshot
 
 
-def _save_todos(data: dict):
-    """保存 TODO 数据"""
-    _ensure_data_dir()
-    TODOS_FILE.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+def _write_todos(todos: tuple, upserts=(), deletes=()):
+    """
+    写入变化的行，并以 todos 构造新快照
+
+    todos 基于当前快照修改得到；若期间其它进程也写了数据库，则新快照标记为过期，下次读取时重新加载
+    """
+    with _lock:
+        conn = _get_conn()
+        with conn:
+            if upserts:
+                conn.executemany(_UPSERT_SQL, [_todo_to_row(t) for t in upserts])
+            if deletes:
+                conn.executemany("DELETE FROM todos WHERE id = ?", [(i,) for i in deletes])
+        key = _db_version(conn)
+        _publish(key if key == _snapshot["key"] else None, todos)
+    _reminder_wakeup.set()
+
+
+def _replace_todos(snap: dict, updated: dict[str, dict]):
+    """用 updated 中的新对象替换同 id 的 TODO 并保存（旧快照保持不变）"""
+    _write_todos(tuple(updated.get(t["id"], t) for t in snap["todos"]), upserts=updated.values())
 
 
 def get_todos(include_completed: bool = False) -> List[dict]:
     """获取所有 TODO"""
-    data = _load_todos()
-    todos = data.get("todos", [])
+    # 排序：重要优先，然后按创建时间（快照中已排好序，返回副本）
+    return list(_load_snapshot()["all_sorted" if include_completed else "active_sorted"])
 
-    if not include_completed:
-        todos = [t for t in todos if not t.get("completed")]
 
-    # 排序：重要优先，然后按创建时间
-    todos.sort(key=lambda t: (not t.get("important", False), t.get("created_at", "")))
-
-    return todos
+def get_version() -> str:
+    """当前数据版本号，TODO 有任何变化（含其它进程写入）时改变"""
+    return f"{_RUN_ID}-{_load_snapshot()['gen']}"
 
 
 def get_todo(todo_id: str) -> Optional[dict]:
     """获取单个 TODO"""
-    data = _load_todos()
-    for todo in data.get("todos", []):
-        if todo["id"] == todo_id:
-            return todo
-    return None
+    return _load_snapshot()["by_id"].get(todo_id)
 
 
 def add_todo(
@@ -97,32 +346,30 @@ def add_todo(
     Returns:
         新建的 TODO
     """
-    data = _load_todos()
-
+    now_iso = datetime.now().isoformat()
     todo = {
         "id": str(uuid.uuid4())[:8],
         "title": title,
         "notes": notes,
         "completed": False,
-        "important": important,
+        "important": bool(important),
         "parent_id": parent_id,
         "remind": remind,
         "remind_tag": remind_tag,
         "last_reminded_at": None,
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat(),
+        "created_at": now_iso,
+        "updated_at": now_iso,
     }
 
-    data["todos"].append(todo)
-    _save_todos(data)
+    with _lock:
+        snap = _refresh()
+        _write_todos(snap["todos"] + (todo,), upserts=(todo,))
 
     return todo
 
 
 def update_todo(todo_id: str, **kwargs) -> Optional[dict]:
     """更新 TODO（支持新增字段）"""
-    data = _load_todos()
-
     # 允许更新的字段白名单
     allowed_fields = {
         "title", "notes", "completed", "important", "parent_id",
@@ -131,22 +378,27 @@ def update_todo(todo_id: str, **kwargs) -> Optional[dict]:
         "remind_at", "reminded", "completed_at",
     }
 
-    for todo in data["todos"]:
-        if todo["id"] == todo_id:
-            for key, value in kwargs.items():
-                if key in allowed_fields:
-                    todo[key] = value
+    with _lock:
+        snap = _refresh()
+        todo = snap["by_id"].get(todo_id)
+        if not todo:
+            return None
 
-            # 如果更新了 remind，自动重置 last_reminded_at 以便重新触发提醒
-            if "remind" in kwargs:
-                todo["last_reminded_at"] = None
-                todo["reminded"] = False  # 兼容旧字段
+        todo = dict(todo)
+        for key, value in kwargs.items():
+            if key in allowed_fields:
+                todo[key] = value
+        if "important" in kwargs:
+            todo["important"] = bool(todo["important"])
 
-            todo["updated_at"] = datetime.now().isoformat()
-            _save_todos(data)
-            return todo
+        # 如果更新了 remind，自动重置 last_reminded_at 以便重新触发提醒
+        if "remind" in kwargs:
+            todo["last_reminded_at"] = None
+            todo["reminded"] = False  # 兼容旧字段
 
-    return None
+        todo["updated_at"] = datetime.now().isoformat()
+        _replace_todos(snap, {todo_id: todo})
+        return todo
 
 
 def complete_todo(todo_id: str) -> bool:
@@ -157,47 +409,44 @@ def complete_todo(todo_id: str) -> bool:
 
 def delete_todo(todo_id: str) -> bool:
     """删除 TODO（包括子任务）"""
-    data = _load_todos()
-
-    # 找到要删除的 TODO 和其子任务
-    ids_to_delete = {todo_id}
-
-    # 递归查找子任务
-    def find_children(parent_id):
-        for todo in data["todos"]:
-            if todo.get("parent_id") == parent_id:
-                ids_to_delete.add(todo["id"])
-                find_children(todo["id"])
+    with _lock:
+        snap = _refresh()
 
-    find_children(todo_id)
-
-    original_count = len(data["todos"])
-    data["todos"] = [t for t in data["todos"] if t["id"] not in ids_to_delete]
+        ids_to_delete = {row[0] for row in _get_conn().execute(_SUBTREE_SQL, (todo_id,))}
+        if not ids_to_delete:
+            return False
 
-    if len(data["todos"]) < original_count:
-        _save_todos(data)
+        remaining = tuple(t for t in snap["todos"] if t["id"] not in ids_to_delete)
+        _write_todos(remaining, deletes=ids_to_delete)
         return True
 
-    return False
-
 
 def toggle_important(todo_id: str) -> Optional[dict]:
     """切换重要状态"""
-    todo = get_todo(todo_id)
-    if todo:
-        return update_todo(todo_id, important=not todo.get("important", False))
+    with _lock:
+        todo = _refresh()["by_id"].get(todo_id)
+        if todo:
+            return update_todo(todo_id, important=not todo.get("important", False))
     return None
 
 
 def _parse_naive_dt(s: str) -> Optional[datetime]:
     """解析 ISO 时间字符串，统一返回无时区的 datetime"""
+    if not isinstance(s, str):
+        return None
+    return _parse_iso_cached(s)
+
+
+@lru_cache(maxsize=1024)
+def _parse_iso_cached(s: str) -> Optional[datetime]:
+    """按字符串缓存解析结果（同一条提醒时间每次检查都会重复解析）"""
     try:
         dt = datetime.fromisoformat(s.replace("Z", "+00:00"))
         # 如果带时区，转为本地时间后去掉 tzinfo
         if dt.tzinfo is not None:
             dt = dt.astimezone().replace(tzinfo=None)
         return dt
-    except (ValueError, AttributeError):
+    except ValueError:
         return None
 
 
@@ -207,11 +456,44 @@ def _is_same_hour_window(dt1: datetime, dt2: datetime) -> bool:
             dt1.day == dt2.day and dt1.hour == dt2.hour)
 
 
-def _should_remind(todo: dict, now: datetime) -> bool:
+def _number_set(values) -> frozenset:
+    """列表中的数字转为 frozenset（忽略非数字项）"""
+    if not isinstance(values, (list, tuple)):
+        return frozenset()
+    return frozenset(v for v in values if isinstance(v, (int, float)))
+
+
+def _compile_remind(remind) -> Optional[tuple]:
+    """
+    把 remind 配置预处理成紧凑的元组，检查时不必再查字典、解析时间
+
+    - ("once", at_datetime)
+    - ("daily", None, hours)
+    - ("weekly", weekdays, {hour})
+    - ("monthly", days, {hour})
+    """
+    if not remind or not isinstance(remind, dict):
+        return None
+
+    remind_type = remind.get("type")
+    if remind_type == "once":
+        at = remind.get("at")
+        return ("once", _parse_naive_dt(at) if at else None)
+    if remind_type == "daily":
+        return ("daily", None, _number_set(remind.get("hours")))
+    if remind_type == "weekly":
+        return ("weekly", _number_set(remind.get("weekdays")), _number_set([remind.get("hour")]))
+    if remind_type == "monthly":
+        return ("monthly", _number_set(remind.get("days")), _number_set([remind.get("hour")]))
+    return None
+
+
+def _should_remind(todo: dict, now: datetime, compiled: Optional[tuple] = None) -> bool:
     """
     判断任务是否应该触发提醒
 
     支持新格式 remind 对象，也兼容旧格式 remind_at 字段
+    compiled: 预编译的 remind（见 _compile_remind），不传时现场编译
     """
     # 已完成的任务不提醒
     if todo.get("completed"):
@@ -222,42 +504,21 @@ def _should_remind(todo: dict, now: datetime) -> bool:
     last_reminded_dt = _parse_naive_dt(last_reminded) if last_reminded else None
 
     # 优先检查新格式 remind 对象
-    remind = todo.get("remind")
-    if remind and isinstance(remind, dict):
-        remind_type = remind.get("type")
-
-        if remind_type == "once":
+    if compiled is None:
+        compiled = _compile_remind(todo.get("remind"))
+    if compiled is not None:
+        if compiled[0] == "once":
             # 一次性提醒：at <= now 且未提醒过
-            at = remind.get("at")
-            if at:
-                remind_time = _parse_naive_dt(at)
-                if remind_time and remind_time <= now and last_reminded_dt is None:
-                    return True
-
-        elif remind_type == "daily":
-            # 每天提醒：当前小时在 hours 中，且今天该小时还没提醒过
-            hours = remind.get("hours", [])
+            remind_time = compiled[1]
+            if remind_time and remind_time <= now and last_reminded_dt is None:
+                return True
+        else:
+            # 周期提醒：当前日期匹配（每周按 weekday 1-7，每月按 day），当前小时匹配，且该小时还没提醒过
+            remind_type, days, hours = compiled
             if now.hour in hours:
-                if last_reminded_dt is None or not _is_same_hour_window(last_reminded_dt, now):
-                    return True
-
-        elif remind_type == "weekly":
-            # 每周提醒：当前 weekday 在 weekdays 中，当前小时 == hour，且今天该小时还没提醒过
-            # weekday: 1=周一, 7=周日
-            weekdays = remind.get("weekdays", [])
-            hour = remind.get("hour")
-            current_weekday = now.isoweekday()  # 1-7
-            if current_weekday in weekdays and now.hour == hour:
-                if last_reminded_dt is None or not _is_same_hour_window(last_reminded_dt, now):
-                    return True
-
-        elif remind_type == "monthly":
-            # 每月提醒：当前 day 在 days 中，当前小时 == hour，且今天该小时还没提醒过
-            days = remind.get("days", [])
-            hour = remind.get("hour")
-            if now.day in days and now.hour == hour:
-                if last_reminded_dt is None or not _is_same_hour_window(last_reminded_dt, now):
-                    return True
+                if days is None or (now.isoweekday() if remind_type == "weekly" else now.day) in days:
+                    if last_reminded_dt is None or not _is_same_hour_window(last_reminded_dt, now):
+                        return True
 
     # 兼容旧格式 remind_at 字段（当作 once 处理）
     remind_at = todo.get("remind_at")
@@ -266,20 +527,99 @@ def _should_remind(todo: dict, now: datetime) -> bool:
         if todo.get("reminded"):
             return False
         remind_time = _parse_naive_dt(remind_at)
-        if remind_time and remind_time <= now:
+        if remind_time and remind_time <= now and not _reminded_since(last_reminded_dt, remind_time):
             return True
 
     return False
 
 
+def _reminded_since(last_reminded_dt: Optional[datetime], remind_time: datetime) -> bool:
+    """旧格式 remind_at：在提醒时间之后已经提醒过（没有 reminded 字段的旧数据靠此判断）"""
+    return last_reminded_dt is not None and last_reminded_dt >= remind_time
+
+
+# 周期提醒向后查找下次触发日期的最大天数（覆盖 29-31 号这类不是每月都有的日期）
+_NEXT_FIRE_MAX_DAYS = 366
+
+
+def _next_hour_slot(hours, day_matches, last_reminded_dt: Optional[datetime], now: datetime) -> Optional[datetime]:
+    """周期提醒：从当前小时起，找到第一个日期匹配且该小时窗口内未提醒过的整点"""
+    hours = sorted({int(h) for h in (hours or []) if h in range(24)})
+    if not hours:
+        return None
+
+    current_hour = now.replace(minute=0, second=0, microsecond=0)
+    day = current_hour.replace(hour=0)
+    for _ in range(_NEXT_FIRE_MAX_DAYS + 1):
+        if day_matches(day):
+            for h in hours:
+                slot = day.replace(hour=h)
+                if slot < current_hour:
+                    continue
+                if last_reminded_dt is not None and _is_same_hour_window(last_reminded_dt, slot):
+                    continue
+                # 当前小时内尚未提醒的立即触发
+                return max(slot, now)
+        day += timedelta(days=1)
+    return None
+
+
+def _compute_next_fire(todo: dict, now: datetime, compiled: Optional[tuple] = None) -> Optional[datetime]:
+    """
+    计算任务下次应触发提醒的时间（与 _should_remind 的判断一致）
+
+    已到期但未提醒的返回 now，不会再提醒的返回 None
+    """
+    if todo.get("completed"):
+        return None
+
+    last_reminded = todo.get("last_reminded_at")
+    last_reminded_dt = _parse_naive_dt(last_reminded) if last_reminded else None
+
+    candidates = []
+
+    if compiled is None:
+        compiled = _compile_remind(todo.get("remind"))
+    if compiled is not None:
+        fire = None
+        if compiled[0] == "once":
+            remind_time = compiled[1]
+            if remind_time and last_reminded_dt is None:
+                fire = max(remind_time, now)
+        else:
+            remind_type, days, hours = compiled
+            if days is None:
+                day_matches = lambda d: True
+            elif remind_type == "weekly":
+                day_matches = lambda d: d.isoweekday() in days
+            else:
+                day_matches = lambda d: d.day in days
+            fire = _next_hour_slot(hours, day_matches, last_reminded_dt, now)
+
+        if fire is not None:
+            candidates.append(fire)
+
+    # 兼容旧格式 remind_at 字段（当作 once 处理）
+    remind_at = todo.get("remind_at")
+    if remind_at and not todo.get("reminded"):
+        remind_time = _parse_naive_dt(remind_at)
+        if remind_time and not _reminded_since(last_reminded_dt, remind_time):
+            candidates.append(max(remind_time, now))
+
+    return min(candidates) if candidates else None
+
+
 def get_pending_reminders() -> List[dict]:
     """获取待发送的提醒"""
     now = datetime.now()
-    data = _load_todos()
     pending = []
 
-    for todo in data["todos"]:
-        if _should_remind(todo, now):
+    snap = _load_snapshot()
+    by_id = snap["by_id"]
+    compiled = snap["compiled"]
+    for todo_id in snap["remindable_ids"]:
+        todo = by_id[todo_id]
+        if _should_remind(todo, now, compiled.get(todo_id)):
             pending.append(todo)
 
     return pending
@@ -287,25 +627,63 @@ def get_pending_reminders() -> List[dict]:
 
 def mark_reminded(todo_id: str):
     """标记为已提醒（设置 last_reminded_at）"""
-    now = datetime.now().isoformat()
-
-    data = _load_todos()
-    for todo in data["todos"]:
-        if todo["id"] == todo_id:
-            todo["last_reminded_at"] = now
-            # 兼容旧格式：同时设置 reminded = True
-            if "reminded" in todo:
+    mark_reminded_bulk([todo_id])
+
+
+def mark_reminded_bulk(todo_ids: List[str]):
+    """批量标记为已提醒，只写入一次数据库"""
+    if not todo_ids:
+        return
+
+    now_iso = datetime.now().isoformat()
+
+    with _lock:
+        snap = _refresh()
+        by_id = snap["by_id"]
+        updated = {}
+        for todo_id in todo_ids:
+            todo = by_id.get(todo_id)
+            if not todo:
+                continue
+            todo = updated[todo_id] = dict(todo)
+            todo["last_reminded_at"] = now_iso
+            # 兼容旧格式：有 remind_at 或 reminded 字段时同时设置 reminded = True
+            if todo.get("remind_at") or "reminded" in todo:
                 todo["reminded"] = True
-            todo["updated_at"] = now
-            _save_todos(data)
-            return
+            todo["updated_at"] = now_iso
+
+        if updated:
+            _replace_todos(snap, updated)
 
 
 
 # ========== Windows 通知 ==========
 
+# 通知弹窗可能阻塞数百毫秒，由单独的线程按顺序发送
+_notify_queue: "queue.Queue[tuple[str, str]]" = queue.Queue()
+_notify_thread: Optional[threading.Thread] = None
+_notify_thread_lock = threading.Lock()
+
+
 def show_windows_notification(title: str, message: str):
-    """显示 Windows 系统通知"""
+    """显示 Windows 系统通知（放入队列后立即返回）"""
+    global _notify_thread
+    with _notify_thread_lock:
+        if _notify_thread is None:
+            _notify_thread = threading.Thread(target=_notify_worker, daemon=True)
+            _notify_thread.start()
+    _notify_queue.put((title, message))
+
+
+def _notify_worker():
+    """通知发送线程"""
+    while True:
+        title, message = _notify_queue.get()
+        _show_notification(title, message)
+
+
+def _show_notification(title: str, message: str):
+    """调用通知后端显示通知（阻塞）"""
     if NOTIFY_BACKEND == "winotify":
         try:
             toast = Notification(
@@ -332,10 +710,32 @@ _reminder_thread = None
 _reminder_running = False
 
 
+def _build_reminder_heap(snap: dict, now: datetime, just_reminded=frozenset()) -> list:
+    """
+    按下次触发时间建立最小堆 [(fire_ts, todo_id)]
+
+    just_reminded: 上一轮刚提醒过的任务，若仍算作立即到期则跳过，避免重复提醒
+    """
+    heap = []
+    by_id = snap["by_id"]
+    compiled = snap["compiled"]
+    for todo_id in snap["remindable_ids"]:
+        fire = _compute_next_fire(by_id[todo_id], now, compiled.get(todo_id))
+        if fire is None or (todo_id in just_reminded and fire <= now):
+            continue
+        heap.append((fire.timestamp(), todo_id))
+    heapq.heapify(heap)
+    return heap
+
+
 def _reminder_loop():
-    """提醒检查循环"""
+    """
+    提醒检查循环
+
+    按最小堆中最近的触发时间精确等待；数据变化时（_write_todos）被唤醒并重建堆。
+    MCP Server 等其它进程写入的修改，最迟在 check_interval 秒后发现。
+    """
     global _reminder_running
-    import time
     import traceback
 
     # 延迟导入避免循环依赖
@@ -343,15 +743,48 @@ def _reminder_loop():
 
     print("[REMIND] 提醒循环线程开始运行")
 
+    heap = []
+    generation = None
+    # 上一轮已提醒的任务 id，重建堆时不再立即触发
+    just_reminded = frozenset()
+
     while _reminder_running:
         try:
-            pending = get_pending_reminders()
+            # 数据库被其它进程修改时会重新加载，gen 随之变化
+            snap = _load_snapshot()
+            if snap["gen"] != generation:
+                generation = snap["gen"]
+                heap = _build_reminder_heap(snap, datetime.now(), just_reminded)
+            just_reminded = frozenset()
+
+            now = datetime.now()
+            now_ts = now.timestamp()
+            due_ids = []
+            while heap and heap[0][0] <= now_ts:
+                due_ids.append(heapq.heappop(heap)[1])
+
+            pending = []
+            if due_ids:
+                by_id = snap["by_id"]
+                compiled = snap["compiled"]
+                for todo_id in due_ids:
+                    todo = by_id.get(todo_id)
+                    if not todo:
+                        continue
+                    if _should_remind(todo, now, compiled.get(todo_id)):
+                        pending.append(todo)
+                    else:
+                        # 错过了触发窗口（如系统休眠），重新排到下一次
+                        fire = _compute_next_fire(todo, now, compiled.get(todo_id))
+                        if fire is not None and fire.timestamp() > now_ts:
+                            heapq.heappush(heap, (fire.timestamp(), todo_id))
+
             if pending:
                 print(f"[REMIND] 发现 {len(pending)} 个待提醒任务")
 
             for todo in pending:
                 title = todo["title"]
-                tag = todo.get("remind_tag", "私人")
+                tag = todo.get("remind_tag", DEFAULT_REMIND_TAG)
 
                 # Windows 通知
                 show_windows_notification("任务提醒", title)
@@ -360,17 +793,22 @@ def _reminder_loop():
                 if tag:
                     send_notify(tag, f"📋 任务提醒：{title}")
 
-                # 标记已提醒
-                mark_reminded(todo["id"])
-
                 print(f"[REMIND] 已发送提醒: {title}")
 
+            # 统一标记已提醒（一次写入，随后重建堆得到下次触发时间）
+            just_reminded = frozenset(todo["id"] for todo in pending)
+            mark_reminded_bulk(list(just_reminded))
+
         except Exception as e:
             print(f"[REMIND] 检查提醒出错: {e}")
             traceback.print_exc()
 
-        # 从配置读取检查间隔
-        time.sleep(config.reminder.check_interval)
+        # 等到最近一次触发时间，最长不超过配置的检查间隔
+        timeout = config.reminder.check_interval
+        if heap:
+            timeout = min(timeout, max(0.0, heap[0][0] - datetime.now().timestamp()))
+        _reminder_wakeup.wait(timeout)
+        _reminder_wakeup.clear()
 
     print("[REMIND] 提醒循环线程已退出")
 
@@ -392,6 +830,7 @@ def stop_reminder_checker():
     """停止提醒检查器"""
     global _reminder_running
     _reminder_running = False
+    _reminder_wakeup.set()
 
 
 # 模块加载时不自动启动，由 main.py 手动调用
@@ -1,12 +1,26 @@
 """
 Local Device Status Dashboard - Backend
 """
+import asyncio
+import gzip
+import json
+import os
+import re
+import time
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Cookie, Response, HTTPException
+from contextvars import ContextVar
+from mimetypes import guess_type
+from fastapi import FastAPI, Depends, Request, Response, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, RedirectResponse
-from pydantic import BaseModel
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, ORJSONResponse, RedirectResponse
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.errors import DictError, MissingError
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.staticfiles import NotModifiedResponse
 from pathlib import Path
 from typing import Optional
 
@@ -15,23 +29,43 @@ from device_info import get_device_info, format_uptime
 from screenshot import take_screenshot
 from media_info import get_media_info
 from auth import verify_totp, generate_device_token, register_verified_token, is_token_valid, TOKEN_VALID_DAYS
+import config
 import local_todo
 import mobile_device
 import app_usage
 
+# 设备推送请求体优先用 msgspec 解码（可选，未安装时使用 pydantic 模型）
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# JSON 响应优先使用 orjson 编码，未安装时回退到标准库
+try:
+    import orjson  # noqa: F401
+    DefaultResponse = ORJSONResponse
+except ImportError:
+    DefaultResponse = JSONResponse
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # 启动时
     local_todo.start_reminder_checker()
-    app_usage.start_tracker()
+    tracker_task = asyncio.create_task(app_usage.tracker_loop())
     yield
     # 关闭时
     local_todo.stop_reminder_checker()
-    app_usage.stop_tracker()
+    tracker_task.cancel()
+    await asyncio.gather(tracker_task, return_exceptions=True)
 
 
-app = FastAPI(title="Local Device Status Dashboard", version="0.1.0", lifespan=lifespan)
+app = FastAPI(
+    title="Local Device Status Dashboard",
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=DefaultResponse,
+)
 
 # 允许前端跨域访问（本地开发用）
 app.add_middleware(
@@ -42,16 +76,145 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 压缩较大的 JSON 响应（已带 Content-Encoding 的预压缩静态文件会被跳过）
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
+
+# 当前请求的分段耗时 [(名称, 毫秒)]，由 ServerTimingMiddleware 为每个请求设置
+_timings: ContextVar[Optional[list]] = ContextVar("server_timings", default=None)
+
+
+class ServerTimingMiddleware:
+    """
+    在响应头中加入 Server-Timing
+
+    app 为收到请求到开始发送响应的总耗时，其余为接口内用 _timed 记录的分段耗时，
+    可在浏览器开发者工具的 Timing 面板中查看
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        timings = []
+        token = _timings.set(timings)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                entries = [f"app;dur={(time.perf_counter() - start) * 1000:.1f}"]
+                entries += [f"{name};dur={ms:.1f}" for name, ms in timings]
+                MutableHeaders(scope=message).append("server-timing", ", ".join(entries))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _timings.reset(token)
+
+
+app.add_middleware(ServerTimingMiddleware)
+
+
+async def _timed(name: str, func):
+    """在线程池中执行阻塞调用，并将耗时记入当前请求的 Server-Timing"""
+    start = time.perf_counter()
+    try:
+        return await asyncio.to_thread(func)
+    finally:
+        timings = _timings.get()
+        if timings is not None:
+            timings.append((name, (time.perf_counter() - start) * 1000))
+
 # 静态文件目录
 FRONTEND_DIR = Path(__file__).parent.parent / "frontend"
 
 # Cookie 名称
 AUTH_COOKIE_NAME = "dashboard_auth"
 
-
-def check_auth(auth_token: Optional[str] = Cookie(None, alias=AUTH_COOKIE_NAME)) -> bool:
-    """检查认证状态"""
-    return is_token_valid(auth_token) if auth_token else False
+# 按需性能分析：开启 debug.profiling 后，已认证的请求带上 ?profile=1 时返回 pyinstrument 的 HTML 报告
+if config.debug.profiling:
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        Profiler = None
+        print("[PROFILE] 未安装 pyinstrument，性能分析不可用")
+
+    if Profiler is not None:
+        @app.middleware("http")
+        async def profile_request(request: Request, call_next):
+            if not request.query_params.get("profile"):
+                return await call_next(request)
+
+            if not _is_authenticated(request):
+                return await call_next(request)
+
+            profiler = Profiler(async_mode="enabled")
+            profiler.start()
+            response = await call_next(request)
+            # 读完响应体，让流式响应等在发送阶段才执行的部分也计入分析
+            async for _ in response.body_iterator:
+                pass
+            profiler.stop()
+            return HTMLResponse(profiler.output_html())
+
+# 移动设备 app_name 中的电量前缀，如 "[85% +] 微信" 或 "[+85%] 微信"（+ 表示充电中）
+_BATTERY_RE = re.compile(r"\[\s*(\+?)\s*(\d+)\s*%?\s*(\+?)\s*\]\s*(.*?)\s*$", re.DOTALL)
+
+
+class TTLCache:
+    """
+    接口结果的短时缓存：{key: (过期时间, 结果)}
+
+    前端按固定间隔轮询，TTL 内的重复请求直接返回上次结果；
+    过期后同一 key 只有一个请求重新计算，其余请求等待其结果
+    """
+
+    def __init__(self):
+        self._entries: dict[str, tuple[float, object]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def get(self, key: str, ttl: float, compute):
+        """compute: 无参数的 async 函数，缓存未命中时调用"""
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() < entry[0]:
+            return entry[1]
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() < entry[0]:
+                return entry[1]
+            value = await compute()
+            self._entries[key] = (time.monotonic() + ttl, value)
+            return value
+
+    def invalidate(self, key: str):
+        self._entries.pop(key, None)
+
+
+_ttl_cache = TTLCache()
+
+# 各接口结果的缓存时间（秒）
+STATUS_TTL = 1.5
+USAGE_TODAY_TTL = 2.0
+USAGE_SUMMARY_TTL = 30.0
+DEVICES_TTL = 2.0
+
+
+def _is_authenticated(request: Request) -> bool:
+    """检查请求 Cookie 中的 token 是否有效"""
+    auth_token = request.cookies.get(AUTH_COOKIE_NAME)
+    return bool(auth_token) and is_token_valid(auth_token)
+
+
+async def require_auth(request: Request):
+    """认证依赖：未认证时返回 401（只查内存中的 token 表，无需放到线程池）"""
+    if not _is_authenticated(request):
+        raise HTTPException(status_code=401, detail="未认证")
 
 
 class VerifyRequest(BaseModel):
@@ -83,13 +246,50 @@ class DeviceUpdateRequest(BaseModel):
     app_name: str = ""
 
 
+if msgspec is not None:
+    class DeviceUpdateStruct(msgspec.Struct):
+        """与 DeviceUpdateRequest 字段相同，用于 /device/set 的快速解码"""
+        secret: str
+        id: str
+        show_name: str
+        using: bool
+        app_name: str = ""
+
+
+def _decode_device_update(body: bytes):
+    """
+    解码设备推送请求体
+
+    字段类型完全匹配时由 msgspec 直接解码；否则交给 pydantic（支持类型转换，出错时返回 422）
+    """
+    if msgspec is not None:
+        try:
+            return msgspec.json.decode(body, type=DeviceUpdateStruct)
+        except (msgspec.ValidationError, msgspec.DecodeError):
+            pass
+    # 以下与 FastAPI 解析请求体的方式一致，保证 422 的错误格式（loc 以 "body" 开头）不变
+    data = None
+    if body:
+        try:
+            data = json.loads(body)
+        except json.JSONDecodeError as e:
+            raise RequestValidationError([ErrorWrapper(e, loc=("body", e.pos))], body=e.doc)
+    if data is None:
+        raise RequestValidationError([ErrorWrapper(MissingError(), loc=("body",))], body=None)
+    if not isinstance(data, dict):
+        raise RequestValidationError([ErrorWrapper(DictError(), loc=("body",))], body=data)
+    try:
+        return DeviceUpdateRequest.parse_obj(data)
+    except ValidationError as e:
+        raise RequestValidationError([ErrorWrapper(e, loc=("body",))], body=data)
+
+
 # ========== 认证 ==========
 
 @app.get("/api/auth/status")
-def auth_status(auth_token: Optional[str] = Cookie(None, alias=AUTH_COOKIE_NAME)):
+async def auth_status(request: Request):
     """检查当前认证状态"""
-    valid = is_token_valid(auth_token) if auth_token else False
-    return {"authenticated": valid}
+    return {"authenticated": _is_authenticated(request)}
 
 
 @app.post("/api/auth/verify")
@@ -121,15 +321,19 @@ def health_check():
 # ========== 设备状态 ==========
 
 @app.get("/api/status")
-def get_status(auth_token: Optional[str] = Cookie(None, alias=AUTH_COOKIE_NAME)):
+async def get_status(_: None = Depends(require_auth)):
     """获取当前设备状态"""
-    if not check_auth(auth_token):
-        raise HTTPException(status_code=401, detail="未认证")
+    return await _ttl_cache.get("status", STATUS_TTL, _build_status)
 
-    window = get_active_window_info()
-    device = get_device_info()
-    open_apps = get_open_apps()
-    media = get_media_info()
+
+async def _build_status() -> dict:
+    # 各项信息互不依赖且都是阻塞调用，放到线程池并发获取
+    window, device, open_apps, media = await asyncio.gather(
+        _timed("window", get_active_window_info),
+        _timed("device", get_device_info),
+        _timed("apps", get_open_apps),
+        _timed("media", get_media_info),
+    )
 
     # 获取今日使用时间
     today_usage = app_usage.get_today_usage()
@@ -171,23 +375,21 @@ def get_status(auth_token: Optional[str] = Cookie(None, alias=AUTH_COOKIE_NAME))
 
 
 @app.post("/api/screenshot")
-def capture_screenshot(auth_token: Optional[str] = Cookie(None, alias=AUTH_COOKIE_NAME)):
+async def capture_screenshot(_: None = Depends(require_auth)):
     """获取全屏截图"""
-    if not check_auth(auth_token):
-        raise HTTPException(status_code=401, detail="未认证")
-
-    result = take_screenshot(save_to_file=False)
+    result = await asyncio.to_thread(take_screenshot, save_to_file=False)
     return result
 
 
 # ========== 应用使用时间统计 ==========
 
 @app.get("/api/usage/today")
-def get_usage_today(auth_token: Optional[str] = Cookie(None, alias=AUTH_COOKIE_NAME)):
+async def get_usage_today(_: None = Depends(require_auth)):
     """获取今日应用使用时间统计"""
-    if not check_auth(auth_token):
-        raise HTTPException(status_code=401, detail="未认证")
+    return await _ttl_cache.get("usage_today", USAGE_TODAY_TTL, lambda: asyncio.to_thread(_build_usage_today))
 
+
+def _build_usage_today() -> dict:
     usage = app_usage.get_today_usage()
 
     # 转换为列表并按使用时间排序
@@ -214,36 +416,31 @@ def get_usage_today(auth_token: Optional[str] = Cookie(None, alias=AUTH_COOKIE_N
 
 
 @app.get("/api/usage/dates")
-def get_usage_dates(auth_token: Optional[str] = Cookie(None, alias=AUTH_COOKIE_NAME)):
+def get_usage_dates(_: None = Depends(require_auth)):
     """获取有统计数据的日期列表"""
-    if not check_auth(auth_token):
-        raise HTTPException(status_code=401, detail="未认证")
-
     return {"dates": app_usage.get_available_dates()}
 
 
 @app.get("/api/usage/week/summary")
-def get_usage_week_summary(auth_token: Optional[str] = Cookie(None, alias=AUTH_COOKIE_NAME)):
+async def get_usage_week_summary(_: None = Depends(require_auth)):
     """获取最近 7 天的使用统计摘要"""
-    if not check_auth(auth_token):
-        raise HTTPException(status_code=401, detail="未认证")
-
-    summary = app_usage.get_week_summary()
-
-    # 为应用添加 app_name
-    for app_item in summary["apps"]:
-        app_item["app_name"] = get_app_name(app_item["process_name"])
-
-    return summary
+    return await _ttl_cache.get(
+        "usage_week", USAGE_SUMMARY_TTL,
+        lambda: asyncio.to_thread(_build_usage_summary, app_usage.get_week_summary),
+    )
 
 
 @app.get("/api/usage/month/summary")
-def get_usage_month_summary(auth_token: Optional[str] = Cookie(None, alias=AUTH_COOKIE_NAME)):
+async def get_usage_month_summary(_: None = Depends(require_auth)):
     """获取最近 30 天的使用统计摘要"""
-    if not check_auth(auth_token):
-        raise HTTPException(status_code=401, detail="未认证")
+    return await _ttl_cache.get(
+        "usage_month", USAGE_SUMMARY_TTL,
+        lambda: asyncio.to_thread(_build_usage_summary, app_usage.get_month_summary),
+    )
 
-    summary = app_usage.get_month_summary()
+
+def _build_usage_summary(get_summary) -> dict:
+    summary = get_summary()
 
     # 为应用添加 app_name
     for app_item in summary["apps"]:
@@ -256,12 +453,9 @@ def get_usage_month_summary(auth_token: Optional[str] = Cookie(None, alias=AUTH_
 def get_app_usage_detail(
     process_name: str,
     days: int = 7,
-    auth_token: Optional[str] = Cookie(None, alias=AUTH_COOKIE_NAME),
+    _: None = Depends(require_auth),
 ):
     """获取指定应用的详细使用数据（用于热力图）"""
-    if not check_auth(auth_token):
-        raise HTTPException(status_code=401, detail="未认证")
-
     detail = app_usage.get_app_detail(process_name, days)
     detail["app_name"] = get_app_name(process_name)
 
@@ -271,12 +465,9 @@ def get_app_usage_detail(
 @app.get("/api/usage/{date_str}")
 def get_usage_by_date(
     date_str: str,
-    auth_token: Optional[str] = Cookie(None, alias=AUTH_COOKIE_NAME),
+    _: None = Depends(require_auth),
 ):
     """获取指定日期的使用时间统计"""
-    if not check_auth(auth_token):
-        raise HTTPException(status_code=401, detail="未认证")
-
     usage = app_usage.get_usage_by_date(date_str)
 
     apps = []
@@ -302,8 +493,9 @@ def get_usage_by_date(
 # ========== 移动设备 ==========
 
 @app.post("/device/set")
-def device_set(req: DeviceUpdateRequest):
+async def device_set(request: Request):
     """接收移动设备状态推送（AutoX.js 兼容）"""
+    req = _decode_device_update(await request.body())
     if not mobile_device.verify_secret(req.secret):
         raise HTTPException(status_code=401, detail="Invalid secret")
 
@@ -312,22 +504,12 @@ def device_set(req: DeviceUpdateRequest):
     charging = None
     app_name = req.app_name
 
-    if app_name.startswith("["):
-        try:
-            bracket_end = app_name.index("]")
-            battery_str = app_name[1:bracket_end]
-            app_name = app_name[bracket_end + 1:].strip()
-
-            # 解析电量和充电状态
-            if "+" in battery_str:
-                charging = True
-                battery_str = battery_str.replace("+", "").strip()
-            else:
-                charging = False
-
-            battery = int(battery_str.replace("%", "").strip())
-        except (ValueError, IndexError):
-            pass
+    m = _BATTERY_RE.match(app_name)
+    if m:
+        battery = int(m.group(2))
+        # "+" 写在数字前后都表示充电中
+        charging = bool(m.group(1) or m.group(3))
+        app_name = m.group(4)
 
     mobile_device.update_device(
         device_id=req.id,
@@ -337,16 +519,18 @@ def device_set(req: DeviceUpdateRequest):
         battery=battery,
         charging=charging,
     )
+    _ttl_cache.invalidate("devices")
 
     return {"success": True, "message": "Status updated"}
 
 
 @app.get("/api/devices")
-def get_devices(auth_token: Optional[str] = Cookie(None, alias=AUTH_COOKIE_NAME)):
+async def get_devices(_: None = Depends(require_auth)):
     """获取所有移动设备状态"""
-    if not check_auth(auth_token):
-        raise HTTPException(status_code=401, detail="未认证")
+    return await _ttl_cache.get("devices", DEVICES_TTL, _build_devices)
+
 
+async def _build_devices() -> dict:
     return {"devices": mobile_device.get_devices()}
 
 
@@ -354,25 +538,28 @@ def get_devices(auth_token: Optional[str] = Cookie(None, alias=AUTH_COOKIE_NAME)
 
 @app.get("/api/todo/tasks")
 def todo_tasks(
+    request: Request,
+    response: Response,
     include_completed: bool = False,
-    auth_token: Optional[str] = Cookie(None, alias=AUTH_COOKIE_NAME),
+    _: None = Depends(require_auth),
 ):
-    """获取所有 TODO"""
-    if not check_auth(auth_token):
-        raise HTTPException(status_code=401, detail="未认证")
-
+    """获取所有 TODO（支持 ETag，数据未变化时返回 304）"""
+    # 先取版本号再取数据：两者之间若有修改，只会多返回一次完整数据，不会误判为未变化
+    etag = f'W/"{local_todo.get_version()}-{int(include_completed)}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
     return {"tasks": local_todo.get_todos(include_completed)}
 
 
 @app.post("/api/todo/tasks")
 def todo_add_task(
     req: AddTaskRequest,
-    auth_token: Optional[str] = Cookie(None, alias=AUTH_COOKIE_NAME),
+    _: None = Depends(require_auth),
 ):
     """添加 TODO"""
-    if not check_auth(auth_token):
-        raise HTTPException(status_code=401, detail="未认证")
-
     todo = local_todo.add_todo(
         title=req.title,
         parent_id=req.parent_id,
@@ -387,12 +574,9 @@ def todo_add_task(
 @app.get("/api/todo/tasks/{task_id}")
 def todo_get_task(
     task_id: str,
-    auth_token: Optional[str] = Cookie(None, alias=AUTH_COOKIE_NAME),
+    _: None = Depends(require_auth),
 ):
     """获取单个 TODO"""
-    if not check_auth(auth_token):
-        raise HTTPException(status_code=401, detail="未认证")
-
     todo = local_todo.get_todo(task_id)
     if not todo:
         raise HTTPException(status_code=404, detail="TODO 不存在")
@@ -404,12 +588,9 @@ def todo_get_task(
 def todo_update_task(
     task_id: str,
     req: UpdateTaskRequest,
-    auth_token: Optional[str] = Cookie(None, alias=AUTH_COOKIE_NAME),
+    _: None = Depends(require_auth),
 ):
     """更新 TODO"""
-    if not check_auth(auth_token):
-        raise HTTPException(status_code=401, detail="未认证")
-
     updates = req.dict(exclude_unset=True)
     if not updates:
         raise HTTPException(status_code=400, detail="无更新内容")
@@ -424,12 +605,9 @@ def todo_update_task(
 @app.post("/api/todo/tasks/{task_id}/complete")
 def todo_complete_task(
     task_id: str,
-    auth_token: Optional[str] = Cookie(None, alias=AUTH_COOKIE_NAME),
+    _: None = Depends(require_auth),
 ):
     """完成 TODO"""
-    if not check_auth(auth_token):
-        raise HTTPException(status_code=401, detail="未认证")
-
     if not local_todo.complete_todo(task_id):
         raise HTTPException(status_code=404, detail="TODO 不存在")
 
@@ -439,12 +617,9 @@ def todo_complete_task(
 @app.post("/api/todo/tasks/{task_id}/toggle-important")
 def todo_toggle_important(
     task_id: str,
-    auth_token: Optional[str] = Cookie(None, alias=AUTH_COOKIE_NAME),
+    _: None = Depends(require_auth),
 ):
     """切换重要状态"""
-    if not check_auth(auth_token):
-        raise HTTPException(status_code=401, detail="未认证")
-
     todo = local_todo.toggle_important(task_id)
     if not todo:
         raise HTTPException(status_code=404, detail="TODO 不存在")
@@ -455,12 +630,9 @@ def todo_toggle_important(
 @app.delete("/api/todo/tasks/{task_id}")
 def todo_delete_task(
     task_id: str,
-    auth_token: Optional[str] = Cookie(None, alias=AUTH_COOKIE_NAME),
+    _: None = Depends(require_auth),
 ):
     """删除 TODO"""
-    if not check_auth(auth_token):
-        raise HTTPException(status_code=401, detail="未认证")
-
     if not local_todo.delete_todo(task_id):
         raise HTTPException(status_code=404, detail="TODO 不存在")
 
@@ -469,17 +641,93 @@ def todo_delete_task(
 
 # ========== 静态文件 & 首页 ==========
 
-app.mount("/static", StaticFiles(directory=FRONTEND_DIR), name="static")
+# 启动时预压缩的文本类静态文件（生成同目录下的 .gz 文件）
+_GZIP_SUFFIXES = {".html", ".js", ".css", ".json", ".svg"}
+_GZIP_MIN_SIZE = 512
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    静态文件服务
+
+    - 客户端支持 gzip 时直接返回预压缩的 .gz 文件，不必每次请求压缩
+    - 文件名不带内容哈希，html/js/css 使用 no-cache（每次用 ETag 协商），图标等允许缓存一天
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # {原文件真实路径: .gz 文件路径}
+        self.gzipped = self._precompress()
+
+    def _precompress(self) -> dict[str, str]:
+        gzipped = {}
+        for src in Path(self.directory).rglob("*"):
+            if src.suffix not in _GZIP_SUFFIXES or not src.is_file():
+                continue
+            gz = src.with_name(src.name + ".gz")
+            try:
+                src_stat = src.stat()
+                if src_stat.st_size < _GZIP_MIN_SIZE:
+                    continue
+                if not gz.exists() or gz.stat().st_mtime < src_stat.st_mtime:
+                    gz.write_bytes(gzip.compress(src.read_bytes(), compresslevel=9, mtime=0))
+            except OSError as e:
+                print(f"[STATIC] 预压缩 {src.name} 失败: {e}")
+                continue
+            gzipped[os.path.realpath(src)] = str(gz)
+        return gzipped
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200):
+        request_headers = Headers(scope=scope)
+        response = None
+
+        gz_path = self.gzipped.get(str(full_path))
+        if gz_path and "gzip" in request_headers.get("accept-encoding", ""):
+            try:
+                gz_stat = os.stat(gz_path)
+            except OSError:
+                gz_stat = None
+            # 运行期间原文件被修改过时 .gz 已过期，返回原文件
+            if gz_stat is not None and gz_stat.st_mtime >= stat_result.st_mtime:
+                response = FileResponse(
+                    gz_path,
+                    status_code=status_code,
+                    stat_result=gz_stat,
+                    method=scope["method"],
+                    media_type=guess_type(str(full_path))[0] or "text/plain",
+                )
+                response.headers["content-encoding"] = "gzip"
+
+        if response is None:
+            response = FileResponse(full_path, status_code=status_code, stat_result=stat_result, method=scope["method"])
+
+        if gz_path:
+            response.headers["vary"] = "Accept-Encoding"
+        if Path(full_path).suffix in _GZIP_SUFFIXES:
+            response.headers["cache-control"] = "no-cache"
+        else:
+            response.headers["cache-control"] = "public, max-age=86400"
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+static_files = PrecompressedStaticFiles(directory=FRONTEND_DIR)
+app.mount("/static", static_files, name="static")
 
 
 @app.get("/")
-def serve_index():
-    """返回前端首页"""
-    return FileResponse(FRONTEND_DIR / "index.html")
+async def serve_index(request: Request):
+    """返回前端首页（与静态文件相同：预压缩、ETag 协商）"""
+    return await static_files.get_response("index.html", request.scope)
 
 
 if __name__ == "__main__":
     import uvicorn
-    import config
 
-    uvicorn.run("main:app", host=config.server.host, port=config.server.port, reload=True)
+    if os.getenv("DEV") == "1":
+        # 开发模式：监视源码变化自动重启（reload 需要以导入字符串启动）
+        uvicorn.run("main:app", host=config.server.host, port=config.server.port, reload=True)
+    else:
+        uvicorn.run(app, host=config.server.host, port=config.server.port)
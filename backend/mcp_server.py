@@ -5,6 +5,7 @@ MCP Server for Dashboard TODO 系统
 使用 Streamable HTTP 传输模式
 """
 
+import asyncio
 from mcp.server.fastmcp import FastMCP
 from typing import Optional
 import local_todo
@@ -23,6 +24,17 @@ mcp = FastMCP(
     stateless_http=True,
 )
 
+# 同时执行的写操作上限
+# 同步工具会直接在事件循环里执行，写操作改为在线程池中运行，并限制并发数量，
+# 避免 LLM 连续调用工具时堆积大量等待写锁的线程
+_TODO_SEM = asyncio.Semaphore(8)
+
+
+async def _run_write(func, *args, **kwargs):
+    """在线程池中执行 local_todo 的写操作"""
+    async with _TODO_SEM:
+        return await asyncio.to_thread(func, *args, **kwargs)
+
 
 @mcp.tool()
 def list_tasks(include_completed: bool = False) -> dict:
@@ -65,7 +77,7 @@ def list_tasks(include_completed: bool = False) -> dict:
 
 
 @mcp.tool()
-def add_task(
+async def add_task(
     title: str,
     important: bool = False,
     notes: str = "",
@@ -89,7 +101,8 @@ def add_task(
     Returns:
         创建的任务信息
     """
-    todo = local_todo.add_todo(
+    todo = await _run_write(
+        local_todo.add_todo,
         title=title,
         important=important,
         notes=notes,
@@ -108,7 +121,7 @@ def add_task(
 
 
 @mcp.tool()
-def complete_task(task_id: str) -> dict:
+async def complete_task(task_id: str) -> dict:
     """
     完成指定任务
 
@@ -118,7 +131,7 @@ def complete_task(task_id: str) -> dict:
     Returns:
         操作结果，包含 success 和 message 字段
     """
-    success = local_todo.complete_todo(task_id)
+    success = await _run_write(local_todo.complete_todo, task_id)
     if success:
         return {"success": True, "message": f"任务 {task_id} 已完成"}
     else:
@@ -126,7 +139,7 @@ def complete_task(task_id: str) -> dict:
 
 
 @mcp.tool()
-def delete_task(task_id: str) -> dict:
+async def delete_task(task_id: str) -> dict:
     """
     删除指定任务
 
@@ -136,7 +149,7 @@ def delete_task(task_id: str) -> dict:
     Returns:
         操作结果，包含 success 和 message 字段
     """
-    success = local_todo.delete_todo(task_id)
+    success = await _run_write(local_todo.delete_todo, task_id)
     if success:
         return {"success": True, "message": f"任务 {task_id} 已删除"}
     else:
@@ -144,7 +157,7 @@ def delete_task(task_id: str) -> dict:
 
 
 @mcp.tool()
-def update_task(
+async def update_task(
     task_id: str,
     title: Optional[str] = None,
     notes: Optional[str] = None,
@@ -182,7 +195,7 @@ def update_task(
     if not kwargs:
         return {"success": False, "message": "没有提供要更新的字段"}
 
-    todo = local_todo.update_todo(task_id, **kwargs)
+    todo = await _run_write(local_todo.update_todo, task_id, **kwargs)
     if todo:
         return {
             "success": True,
@@ -2,6 +2,7 @@
 SMTC (System Media Transport Controls) 媒体信息获取
 """
 import asyncio
+import base64
 from typing import Optional
 
 try:
@@ -14,77 +15,152 @@ try:
 except ImportError:
     WINSDK_AVAILABLE = False
 
+# base64 编码（优先使用 pybase64，未安装时回退到标准库）
+try:
+    import pybase64
+except ImportError:
+    pybase64 = None
+
 
 # 目标应用（只读取这个应用的媒体信息）
 TARGET_APP_ID = "splayer"
 
 
+def _b64encode(data) -> str:
+    if pybase64 is not None:
+        return pybase64.b64encode_as_string(data)
+    return base64.b64encode(data).decode("ascii")
+
+
 async def _get_thumbnail_base64(thumbnail_ref: IRandomAccessStreamReference) -> Optional[str]:
     """获取缩略图并转换为 base64"""
     try:
-        import base64
         stream = await thumbnail_ref.open_read_async()
         size = stream.size
         reader = DataReader(stream)
         await reader.load_async(size)
-        buffer = reader.read_buffer(size)
-        # 转换为 bytes
-        data = bytes(buffer)
-        return f"data:image/png;base64,{base64.b64encode(data).decode()}"
+        # 直接读入 bytearray，省去 IBuffer 及其到 bytes 的复制
+        data = bytearray(size)
+        reader.read_bytes(data)
+        return f"data:image/png;base64,{_b64encode(data)}"
     except Exception:
         return None
 
 
+# 缓存的 SMTC 会话管理器，以及上次找到的目标应用会话
+# 会话列表变化时（应用启动/退出）清空目标会话，下次调用重新查找
+_manager: Optional["SessionManager"] = None
+_target_session: Optional["Session"] = None
+
+# 上次读取的封面图：((标题, 艺术家, 专辑, 曲目号), data URL)，曲目不变时直接复用
+_thumb_cache: Optional[tuple[tuple, str]] = None
+
+# 播放状态
+_STATUS_MAP = {
+    0: "closed",
+    1: "opened",
+    2: "changing",
+    3: "stopped",
+    4: "playing",
+    5: "paused",
+}
+
+
+def _on_sessions_changed(sender, args):
+    """SessionsChanged 事件回调（在 WinRT 线程中调用）"""
+    global _target_session
+    _target_session = None
+
+
+async def _get_manager() -> "SessionManager":
+    """获取会话管理器（首次调用时请求并订阅会话变化事件）"""
+    global _manager
+    if _manager is None:
+        manager = await SessionManager.request_async()
+        manager.add_sessions_changed(_on_sessions_changed)
+        _manager = manager
+    return _manager
+
+
+async def _get_thumbnail(info) -> Optional[str]:
+    """获取封面图，曲目未变化时复用上次的结果"""
+    global _thumb_cache
+
+    key = (info.title, info.artist, info.album_title, info.track_number)
+    if _thumb_cache is not None and _thumb_cache[0] == key:
+        return _thumb_cache[1]
+
+    thumbnail = await _get_thumbnail_base64(info.thumbnail)
+    # 读取失败时不缓存，下次重试
+    if thumbnail is not None:
+        _thumb_cache = (key, thumbnail)
+    return thumbnail
+
+
+async def _read_session(session: "Session") -> Optional[dict]:
+    """读取会话的媒体信息，没有媒体属性时返回 None"""
+    # 获取媒体属性
+    info = await session.try_get_media_properties_async()
+    if not info:
+        return None
+
+    # 获取播放状态
+    playback = session.get_playback_info()
+    playback_status = _STATUS_MAP.get(playback.playback_status, "unknown")
+
+    # 获取封面图
+    thumbnail = None
+    if info.thumbnail:
+        thumbnail = await _get_thumbnail(info)
+
+    return {
+        "available": True,
+        "app_id": session.source_app_user_model_id or "",
+        "title": info.title or "",
+        "artist": info.artist or "",
+        "album": info.album_title or "",
+        "album_artist": info.album_artist or "",
+        "track_number": info.track_number,
+        "playback_status": playback_status,
+        "thumbnail": thumbnail,
+    }
+
+
 async def _get_media_info_async() -> dict:
     """异步获取媒体信息"""
+    global _manager, _target_session
+
     if not WINSDK_AVAILABLE:
         return {"available": False, "error": "winsdk 未安装"}
 
     try:
-        manager = await SessionManager.request_async()
+        # 优先读取上次找到的会话，省去遍历会话列表
+        session = _target_session
+        if session is not None:
+            try:
+                result = await _read_session(session)
+                if result:
+                    return result
+            except Exception:
+                # 会话已失效，重新查找
+                _target_session = None
+
+        manager = await _get_manager()
         sessions = manager.get_sessions()
 
         # 遍历所有会话，找到目标应用
+        target = TARGET_APP_ID.lower()
         for session in sessions:
             app_id = session.source_app_user_model_id or ""
 
             # 检查是否是目标应用
-            if TARGET_APP_ID.lower() not in app_id.lower():
-                continue
-
-            # 获取媒体属性
-            info = await session.try_get_media_properties_async()
-            if not info:
+            if target not in app_id.lower():
                 continue
 
-            # 获取播放状态
-            playback = session.get_playback_info()
-            status_map = {
-                0: "closed",
-                1: "opened",
-                2: "changing",
-                3: "stopped",
-                4: "playing",
-                5: "paused",
-            }
-            playback_status = status_map.get(playback.playback_status, "unknown")
-
-            # 获取封面图
-            thumbnail = None
-            if info.thumbnail:
-                thumbnail = await _get_thumbnail_base64(info.thumbnail)
-
-            return {
-                "available": True,
-                "app_id": app_id,
-                "title": info.title or "",
-                "artist": info.artist or "",
-                "album": info.album_title or "",
-                "album_artist": info.album_artist or "",
-                "track_number": info.track_number,
-                "playback_status": playback_status,
-                "thumbnail": thumbnail,
-            }
+            result = await _read_session(session)
+            if result:
+                _target_session = session
+                return result
 
         # 未找到目标应用的会话
         return {
@@ -93,6 +169,9 @@ async def _get_media_info_async() -> dict:
         }
 
     except Exception as e:
+        # 缓存的对象可能已失效，下次调用重新获取
+        _manager = None
+        _target_session = None
         return {
             "available": False,
             "error": str(e),
@@ -2,8 +2,10 @@
 移动设备状态管理
 """
 import secrets
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Optional
 
 import config
@@ -12,9 +14,27 @@ import config
 CONFIG_DIR = Path(__file__).parent.parent / "config"
 SECRET_FILE = CONFIG_DIR / "device_secret.txt"
 
+
+@dataclass(slots=True)
+class DeviceState:
+    """设备最近一次上报的状态"""
+    show_name: str
+    using: bool
+    app_name: str
+    battery: Optional[int]
+    charging: Optional[bool]
+    # 上报时的 time.monotonic()，用于判断超时
+    last_seen: float
+    # 上报时间的显示文本 "HH:MM:SS"（上报时生成一次）
+    last_update: str
+
+
 # 设备状态存储（内存）
-# 格式: {device_id: {show_name, using, app_name, battery, charging, last_update}}
-_devices: dict[str, dict] = {}
+# 格式: {device_id: DeviceState}
+_devices: dict[str, DeviceState] = {}
+
+# 设备密钥缓存（密钥运行期间不会变化，修改密钥文件后需重启服务）
+_cached_secret: Optional[str] = None
 
 # 从配置读取
 def _get_timeout() -> int:
@@ -27,22 +47,28 @@ def _ensure_config_dir():
 
 def get_or_create_secret() -> str:
     """获取或创建设备推送密钥"""
+    global _cached_secret
+    if _cached_secret is not None:
+        return _cached_secret
+
     _ensure_config_dir()
 
     if SECRET_FILE.exists():
-        return SECRET_FILE.read_text().strip()
+        _cached_secret = SECRET_FILE.read_text().strip()
+        return _cached_secret
 
     # 生成新密钥
     secret = secrets.token_urlsafe(32)
     SECRET_FILE.write_text(secret)
     print(f"[DEVICE] 已生成设备密钥: {secret}")
     print(f"[DEVICE] 密钥文件: {SECRET_FILE}")
+    _cached_secret = secret
     return secret
 
 
 def verify_secret(secret: str) -> bool:
-    """验证设备密钥"""
-    return secret == get_or_create_secret()
+    """验证设备密钥（恒定时间比较）"""
+    return secrets.compare_digest(secret.encode(), get_or_create_secret().encode())
 
 
 def update_device(
@@ -54,61 +80,45 @@ def update_device(
     charging: Optional[bool] = None,
 ):
     """更新设备状态"""
-    _devices[device_id] = {
-        "show_name": show_name,
-        "using": using,
-        "app_name": app_name,
-        "battery": battery,
-        "charging": charging,
-        "last_update": datetime.now(),
-    }
+    _devices[device_id] = DeviceState(
+        show_name=show_name,
+        using=using,
+        app_name=app_name,
+        battery=battery,
+        charging=charging,
+        last_seen=time.monotonic(),
+        last_update=datetime.now().strftime("%H:%M:%S"),
+    )
 
 
-def get_devices() -> list:
-    """获取所有设备状态"""
-    now = datetime.now()
-    result = []
-    timeout = _get_timeout()
+def _device_to_dict(device_id: str, info: DeviceState, cutoff: float) -> dict:
+    """将设备状态转换为接口返回格式（cutoff 之前上报的设备视为离线）"""
+    online = info.last_seen > cutoff
 
-    for device_id, info in _devices.items():
-        # 检查是否超时
-        elapsed = (now - info["last_update"]).total_seconds()
-        online = elapsed < timeout
+    return {
+        "id": device_id,
+        "show_name": info.show_name,
+        "using": info.using if online else False,
+        "app_name": info.app_name if online else "",
+        "battery": info.battery,
+        "charging": info.charging,
+        "online": online,
+        "last_update": info.last_update,
+    }
 
-        result.append({
-            "id": device_id,
-            "show_name": info["show_name"],
-            "using": info["using"] if online else False,
-            "app_name": info["app_name"] if online else "",
-            "battery": info["battery"],
-            "charging": info["charging"],
-            "online": online,
-            "last_update": info["last_update"].strftime("%H:%M:%S"),
-        })
 
-    return result
+def get_devices() -> list:
+    """获取所有设备状态"""
+    cutoff = time.monotonic() - _get_timeout()
+    return [_device_to_dict(device_id, info, cutoff) for device_id, info in _devices.items()]
 
 
 def get_device(device_id: str) -> Optional[dict]:
     """获取单个设备状态"""
-    if device_id not in _devices:
+    info = _devices.get(device_id)
+    if info is None:
         return None
-
-    info = _devices[device_id]
-    now = datetime.now()
-    elapsed = (now - info["last_update"]).total_seconds()
-    online = elapsed < _get_timeout()
-
-    return {
-        "id": device_id,
-        "show_name": info["show_name"],
-        "using": info["using"] if online else False,
-        "app_name": info["app_name"] if online else "",
-        "battery": info["battery"],
-        "charging": info["charging"],
-        "online": online,
-        "last_update": info["last_update"].strftime("%H:%M:%S"),
-    }
+    return _device_to_dict(device_id, info, time.monotonic() - _get_timeout())
 
 
 # 启动时确保密钥存在
@@ -3,7 +3,8 @@ QQ Bot 通知模块 (NapCat WebSocket)
 """
 import json
 import asyncio
-import sys
+import itertools
+import threading
 from typing import Optional
 
 import config
@@ -19,50 +20,111 @@ def _get_targets() -> dict:
     return config.qq_notify.targets
 
 
-async def _send_message(target_type: str, target_id: int, message: str) -> bool:
-    """通过 WebSocket 发送消息"""
-    try:
-        import websockets
+# 单次 API 调用的超时时间（秒，含建立连接）
+_CALL_TIMEOUT = 8
+
+
+class _QQClient:
+    """
+    NapCat WebSocket 长连接
 
-        ws_url = _get_ws_url()
-        token = _get_token()
+    连接在首次调用时建立，断开后在下次调用时重连；
+    读取任务按 echo 将 API 响应交给等待中的调用，推送事件直接丢弃。
+    心跳由 websockets 自动处理（ping_interval）
+    """
 
-        async with websockets.connect(
-            ws_url,
-            extra_headers={"Authorization": f"Bearer {token}"} if token else None,
-        ) as ws:
-            # 短暂等待并丢弃连接后的 lifecycle 事件
+    def __init__(self):
+        self._ws = None
+        self._reader: Optional[asyncio.Task] = None
+        self._connect_lock: Optional[asyncio.Lock] = None
+        # 等待响应的调用 {echo: Future}
+        self._pending: dict[str, asyncio.Future] = {}
+        self._echo = itertools.count(1)
+
+    async def _ensure_connected(self):
+        if self._ws is not None:
+            return self._ws
+
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+
+        async with self._connect_lock:
+            if self._ws is None:
+                import websockets
+
+                token = _get_token()
+                ws = await websockets.connect(
+                    _get_ws_url(),
+                    extra_headers={"Authorization": f"Bearer {token}"} if token else None,
+                )
+                self._ws = ws
+                self._reader = asyncio.get_running_loop().create_task(self._read_loop(ws))
+                print("[QQ] 已连接 NapCat")
+            return self._ws
+
+    async def _read_loop(self, ws):
+        """读取消息并分发 API 响应，连接断开时让所有等待中的调用失败"""
+        try:
+            async for raw in ws:
+                # 推送事件没有 echo 字段，不必解析
+                if isinstance(raw, str) and '"echo"' not in raw:
+                    continue
+                data = json.loads(raw)
+                future = self._pending.pop(str(data.get("echo")), None)
+                if future is not None and not future.done():
+                    future.set_result(data)
+        except Exception as e:
+            print(f"[QQ] 连接断开: {e}")
+        finally:
+            if self._ws is ws:
+                self._ws = None
+            pending, self._pending = self._pending, {}
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("WebSocket 连接已断开"))
+
+    async def call(self, action: str, params: dict) -> dict:
+        """调用 NapCat API 并返回响应"""
+        from websockets.exceptions import ConnectionClosed
+
+        echo = str(next(self._echo))
+        payload = json.dumps({"action": action, "params": params, "echo": echo})
+
+        for attempt in range(2):
+            ws = await self._ensure_connected()
+            future = asyncio.get_running_loop().create_future()
+            self._pending[echo] = future
             try:
-                while True:
-                    init_msg = await asyncio.wait_for(ws.recv(), timeout=0.5)
-                    data = json.loads(init_msg)
-                    if data.get("post_type") == "meta_event":
-                        continue
-                    break
-            except asyncio.TimeoutError:
-                pass  # 没有更多初始消息，继续发送
-
-            if target_type == "private":
-                action = "send_private_msg"
-                params = {"user_id": target_id, "message": message}
-            else:
-                action = "send_group_msg"
-                params = {"group_id": target_id, "message": message}
-
-            payload = {
-                "action": action,
-                "params": params,
-                "echo": "send_msg",
-            }
-
-            await ws.send(json.dumps(payload))
-
-            # 等待 API 响应（跳过推送事件）
-            while True:
-                response = await asyncio.wait_for(ws.recv(), timeout=5)
-                result = json.loads(response)
-                if result.get("echo") == "send_msg":
-                    return result.get("status") == "ok"
+                await ws.send(payload)
+                return await future
+            except ConnectionClosed:
+                # 对方已关闭连接但读取任务尚未清理，重新连接后重试一次
+                if self._ws is ws:
+                    self._ws = None
+                if attempt:
+                    raise
+            finally:
+                self._pending.pop(echo, None)
+                # 连接断开时读取任务可能已给 future 设置了异常，取出以免报未处理
+                if future.done() and not future.cancelled():
+                    future.exception()
+
+
+_client = _QQClient()
+
+
+async def _send_message(target_type: str, target_id: int, message: str) -> bool:
+    """通过 WebSocket 发送消息"""
+    if target_type == "private":
+        action = "send_private_msg"
+        params = {"user_id": target_id, "message": message}
+    else:
+        action = "send_group_msg"
+        params = {"group_id": target_id, "message": message}
+
+    try:
+        result = await asyncio.wait_for(_client.call(action, params), timeout=_CALL_TIMEOUT)
+        return result.get("status") == "ok"
 
     except asyncio.TimeoutError:
         # 超时但消息可能已发送成功（没收到回执）
@@ -73,23 +135,24 @@ async def _send_message(target_type: str, target_id: int, message: str) -> bool:
         return False
 
 
+# 长连接所在的后台事件循环（首次发送时启动）
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="qq-notify", daemon=True).start()
+            _loop = loop
+    return _loop
+
+
 def _run_async(coro):
-    """安全运行异步函数（兼容 Windows）"""
-    # Windows 上需要使用 WindowsSelectorEventLoopPolicy 或者新创建事件循环
-    if sys.platform == 'win32':
-        # 如果当前已有运行中的事件循环，创建新循环
-        try:
-            loop = asyncio.get_running_loop()
-            # 在已有循环中运行（如在 FastAPI 上下文中）
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as pool:
-                future = pool.submit(asyncio.run, coro)
-                return future.result(timeout=10)
-        except RuntimeError:
-            # 没有运行中的循环，直接用 asyncio.run
-            return asyncio.run(coro)
-    else:
-        return asyncio.run(coro)
+    """在后台事件循环中运行协程并等待结果（可在任意线程调用，包括 FastAPI 的事件循环外）"""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result(timeout=_CALL_TIMEOUT + 2)
 
 
 def send_notify(tag: str, message: str) -> bool:
@@ -5,12 +5,43 @@ import io
 import base64
 from datetime import datetime
 from pathlib import Path
-from PIL import ImageGrab
+from PIL import Image, ImageGrab
+
+# base64 编码（优先使用 pybase64，未安装时回退到标准库）
+try:
+    import pybase64
+except ImportError:
+    pybase64 = None
 
 
 # 截图保存目录
 SCREENSHOTS_DIR = Path(__file__).parent.parent / "screenshots"
 
+# 返回给前端预览的图片格式：JPEG 编码比 PNG（optimize）快得多，体积也小得多
+# 保存到文件时仍使用无损的 PNG
+PREVIEW_FORMAT = "JPEG"
+PREVIEW_MIME = "image/jpeg"
+PREVIEW_QUALITY = 80
+# 预览图最长边（像素），超过时等比缩小后再编码
+PREVIEW_MAX_SIZE = 1920
+
+
+def _b64encode(data) -> str:
+    if pybase64 is not None:
+        return pybase64.b64encode_as_string(data)
+    return base64.b64encode(data).decode("ascii")
+
+
+def _preview_image(img: Image.Image) -> Image.Image:
+    """生成预览图：缩小到 PREVIEW_MAX_SIZE 以内并转换为 RGB（不修改原图）"""
+    scale = PREVIEW_MAX_SIZE / max(img.size)
+    if scale < 1:
+        size = (round(img.width * scale), round(img.height * scale))
+        img = img.resize(size, Image.Resampling.BILINEAR, reducing_gap=2.0)
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    return img
+
 
 def take_screenshot(save_to_file: bool = False) -> dict:
     """
@@ -23,7 +54,7 @@ def take_screenshot(save_to_file: bool = False) -> dict:
         {
             "success": True,
             "timestamp": "2024-01-01 12:00:00",
-            "base64": "data:image/png;base64,...",
+            "base64": "data:image/jpeg;base64,...",
             "file_path": "screenshots/xxx.png" (如果保存了文件)
         }
     """
@@ -34,14 +65,16 @@ def take_screenshot(save_to_file: bool = False) -> dict:
 
         # 转换为 base64
         buffer = io.BytesIO()
-        img.save(buffer, format="PNG", optimize=True)
-        buffer.seek(0)
-        b64_data = base64.b64encode(buffer.getvalue()).decode("utf-8")
+        preview = _preview_image(img)
+        preview.save(buffer, format=PREVIEW_FORMAT, quality=PREVIEW_QUALITY)
+        # 直接编码 BytesIO 的内部缓冲区，不复制出一份 bytes
+        with buffer.getbuffer() as view:
+            b64_data = _b64encode(view)
 
         result = {
             "success": True,
             "timestamp": timestamp.strftime("%Y-%m-%d %H:%M:%S"),
-            "base64": f"data:image/png;base64,{b64_data}",
+            "base64": f"data:{PREVIEW_MIME};base64,{b64_data}",
             "width": img.width,
             "height": img.height,
         }
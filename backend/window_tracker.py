@@ -1,26 +1,64 @@
 """
 Windows 活动窗口信息采集
 """
+import ctypes
 import json
+from ctypes import wintypes
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 
+import win32con
 import win32gui
 import win32process
 import psutil
 
+# JSON 解析（优先使用 orjson，未安装时回退到标准库）
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# DWM 窗口隐藏（cloak）状态查询，用于过滤挂起的 UWP 应用等不可见窗口
+try:
+    _dwmapi = ctypes.windll.dwmapi
+except (AttributeError, OSError):
+    _dwmapi = None
+
+DWMWA_CLOAKED = 14
+# 被系统外壳隐藏（如位于其他虚拟桌面），这类窗口仍算作打开的应用
+DWM_CLOAKED_SHELL = 0x2
+
 
 # 配置文件路径
 CONFIG_DIR = Path(__file__).parent
 APP_NAMES_FILE = CONFIG_DIR / "app_names.json"
 
 
+# 映射表文件的 (mtime_ns, size)，未变化时 reload_app_names 不重新解析
+_app_names_key: Optional[tuple] = None
+
+
+def _app_names_stat() -> Optional[tuple]:
+    try:
+        st = APP_NAMES_FILE.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
 def _load_app_names() -> dict:
     """加载进程名映射表"""
-    if APP_NAMES_FILE.exists():
+    global _app_names_key
+    _app_names_key = _app_names_stat()
+
+    if _app_names_key is not None:
         try:
-            with open(APP_NAMES_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
+            raw = APP_NAMES_FILE.read_bytes()
+            if orjson is not None:
+                return orjson.loads(raw)
+            return json.loads(raw.decode("utf-8"))
+        except (ValueError, IOError):
             pass
     return {}
 
@@ -29,7 +67,8 @@ def _load_app_names() -> dict:
 APP_NAME_MAP = _load_app_names()
 
 # 需要排除的进程（系统进程、后台服务等）
-EXCLUDED_PROCESSES = {
+# Windows 进程名不区分大小写，统一 casefold 后比较
+EXCLUDED_PROCESSES = frozenset(name.casefold() for name in (
     "TextInputHost.exe",
     "ApplicationFrameHost.exe",
     "SystemSettings.exe",
@@ -37,20 +76,73 @@ EXCLUDED_PROCESSES = {
     "StartMenuExperienceHost.exe",
     "SearchHost.exe",
     "LockApp.exe",
-}
+))
 
 
 def reload_app_names():
-    """重新加载映射表（热更新用）"""
+    """重新加载映射表（热更新用，文件未修改时跳过）"""
     global APP_NAME_MAP
+    if _app_names_stat() == _app_names_key:
+        return
     APP_NAME_MAP = _load_app_names()
+    get_app_name.cache_clear()
 
 
+@lru_cache(maxsize=4096)
 def get_app_name(process_name: str) -> str:
-    """获取进程的易读名称"""
+    """获取进程的易读名称（结果缓存，映射表重新加载时清空）"""
     return APP_NAME_MAP.get(process_name, process_name.replace(".exe", ""))
 
 
+def _is_cloaked(hwnd) -> bool:
+    """窗口是否被 DWM 隐藏（其他虚拟桌面上的窗口除外）"""
+    if _dwmapi is None:
+        return False
+    cloaked = wintypes.DWORD(0)
+    result = _dwmapi.DwmGetWindowAttribute(
+        wintypes.HWND(hwnd), DWMWA_CLOAKED, ctypes.byref(cloaked), ctypes.sizeof(cloaked)
+    )
+    return result == 0 and cloaked.value not in (0, DWM_CLOAKED_SHELL)
+
+
+def _is_app_window(hwnd) -> bool:
+    """
+    按 Alt+Tab 的规则判断是否为应用主窗口
+
+    排除工具窗口、被其他窗口拥有的对话框（除非声明了 WS_EX_APPWINDOW）和被隐藏的窗口，
+    这些判断都不需要查询进程
+    """
+    ex_style = win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE)
+    if ex_style & win32con.WS_EX_TOOLWINDOW:
+        return False
+    if win32gui.GetWindow(hwnd, win32con.GW_OWNER) and not ex_style & win32con.WS_EX_APPWINDOW:
+        return False
+    return not _is_cloaked(hwnd)
+
+
+# 上次查询的前台窗口进程名: (hwnd, pid, process_name)
+# 窗口句柄只属于一个进程，(hwnd, pid) 都相同时可认为仍是同一进程
+_foreground_cache: tuple = (None, None, "")
+
+
+def _foreground_process_name(hwnd, pid: int) -> str:
+    """获取前台窗口的进程名"""
+    global _foreground_cache
+
+    cached_hwnd, cached_pid, cached_name = _foreground_cache
+    if hwnd == cached_hwnd and pid == cached_pid:
+        return cached_name
+
+    try:
+        process_name = psutil.Process(pid).name()
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        # 查询失败不缓存，下次重试
+        return "unknown"
+
+    _foreground_cache = (hwnd, pid, process_name)
+    return process_name
+
+
 def get_active_window_info() -> dict:
     """
     获取当前活动窗口信息
@@ -74,12 +166,8 @@ def get_active_window_info() -> dict:
         # 获取进程ID
         _, pid = win32process.GetWindowThreadProcessId(hwnd)
 
-        # 获取进程名
-        try:
-            process = psutil.Process(pid)
-            process_name = process.name()
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            process_name = "unknown"
+        # 获取进程名（前台窗口未变化时直接复用）
+        process_name = _foreground_process_name(hwnd, pid)
 
         # 映射为易读名称
         app_name = get_app_name(process_name)
@@ -110,10 +198,11 @@ def get_open_apps() -> list:
         ]
     """
     apps = {}  # 用 pid 去重
+    skipped_pids = set()  # 已排除或无法查询的进程
 
     def enum_callback(hwnd, _):
-        # 只处理可见窗口
-        if not win32gui.IsWindowVisible(hwnd):
+        # 只处理可见的应用窗口
+        if not win32gui.IsWindowVisible(hwnd) or not _is_app_window(hwnd):
             return True
 
         # 获取窗口标题
@@ -121,34 +210,40 @@ def get_open_apps() -> list:
         if not title:
             return True
 
-        # 获取进程信息
         try:
             _, pid = win32process.GetWindowThreadProcessId(hwnd)
-            process = psutil.Process(pid)
-            process_name = process.name()
+        except Exception:
+            return True
+
+        # 用 pid 去重，保留第一个（通常是主窗口）；同一进程只查询一次进程名
+        if pid in apps or pid in skipped_pids:
+            return True
+
+        # 获取进程信息
+        try:
+            process_name = psutil.Process(pid).name()
         except (psutil.NoSuchProcess, psutil.AccessDenied, Exception):
+            skipped_pids.add(pid)
             return True
 
         # 排除系统进程
-        if process_name in EXCLUDED_PROCESSES:
+        if process_name.casefold() in EXCLUDED_PROCESSES:
+            skipped_pids.add(pid)
             return True
 
-        # 用 pid 去重，保留第一个（通常是主窗口）
-        if pid not in apps:
-            app_name = get_app_name(process_name)
-            apps[pid] = {
-                "process_name": process_name,
-                "app_name": app_name,
-                "title": title,
-                "pid": pid,
-            }
+        apps[pid] = {
+            "process_name": process_name,
+            "app_name": get_app_name(process_name),
+            "title": title,
+            "pid": pid,
+        }
 
         return True
 
     win32gui.EnumWindows(enum_callback, None)
 
-    # 按应用名排序
-    return sorted(apps.values(), key=lambda x: x["app_name"].lower())
+    # 按应用名排序（不区分大小写）
+    return sorted(apps.values(), key=lambda x: x["app_name"].casefold())
 
 
 def _empty_result() -> dict:
@@ -0,0 +1,105 @@
+"""
+app_usage 每日分片存储与旧数据迁移的回归测试
+"""
+import json
+import sys
+import types
+from array import array
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+# window_tracker 依赖 pywin32，非 Windows 环境下用假的活动窗口模块代替
+try:
+    import window_tracker  # noqa: F401
+except ImportError:
+    sys.modules["window_tracker"] = types.SimpleNamespace(get_active_window_info=lambda: {})
+
+import app_usage  # noqa: E402
+
+# 固定的历史日期，避免与“今天”的内存数据混在一起
+DAY_V1 = "2024-01-01"
+DAY_V2 = "2024-01-02"
+DAY_V3 = "2024-01-03"
+
+
+@pytest.fixture
+def usage_store(tmp_path, monkeypatch):
+    """使用临时目录中的数据文件，测试结束后恢复模块状态"""
+    monkeypatch.setattr(app_usage, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(app_usage, "USAGE_DIR", tmp_path / "usage")
+    monkeypatch.setattr(app_usage, "USAGE_FILE", tmp_path / "app_usage.json")
+    monkeypatch.setattr(app_usage, "_cache", {})
+    monkeypatch.setattr(app_usage, "_dates_cache", None)
+    monkeypatch.setattr(app_usage, "_legacy_checked", False)
+    monkeypatch.setattr(app_usage, "_today", ({}, array("i")))
+    monkeypatch.setattr(app_usage, "_today_date", None)
+    monkeypatch.setattr(app_usage, "_dirty", False)
+    monkeypatch.setattr(app_usage, "_next_midnight_ts", 0.0)
+    return app_usage
+
+
+def _write_legacy_file(store):
+    """写入包含 v1 与 v2 两种格式的旧版单文件数据"""
+    store.USAGE_FILE.write_text(json.dumps({
+        "daily": {
+            DAY_V1: {"code.exe": 120, "chrome.exe": 30},
+            DAY_V2: {"code.exe": {"total": 90, "hours": {"09": 60, "23": 30}}},
+        },
+    }), encoding="utf-8")
+
+
+def test_day_shard_format(usage_store):
+    """每天的数据单独写入 usage/YYYY-MM-DD.json，带版本号"""
+    apps = {"code.exe": {"total": 15, "hours": [0] * 10 + [15] + [0] * 13}}
+    usage_store._save_day(DAY_V3, apps)
+
+    path = usage_store.USAGE_DIR / f"{DAY_V3}.json"
+    assert json.loads(path.read_text(encoding="utf-8")) == {
+        "version": usage_store.DATA_VERSION,
+        "apps": apps,
+    }
+    assert usage_store._load_day(DAY_V3) == apps
+    assert usage_store._list_dates() == [DAY_V3]
+
+
+def test_legacy_file_is_split_and_renamed(usage_store):
+    """旧版 app_usage.json 拆分为每日文件后重命名为 .json.bak"""
+    _write_legacy_file(usage_store)
+
+    assert usage_store._list_dates() == [DAY_V1, DAY_V2]
+    assert not usage_store.USAGE_FILE.exists()
+    assert usage_store.USAGE_FILE.with_suffix(".json.bak").exists()
+
+    for date_str in (DAY_V1, DAY_V2):
+        data = json.loads((usage_store.USAGE_DIR / f"{date_str}.json").read_text(encoding="utf-8"))
+        assert data["version"] == usage_store.DATA_VERSION
+
+
+def test_legacy_apps_migrated_to_v3(usage_store):
+    """v1 秒数与 v2 小时字典都迁移为长度 24 的小时列表"""
+    _write_legacy_file(usage_store)
+
+    v1 = usage_store._load_day(DAY_V1)
+    assert v1["code.exe"] == {"total": 120, "hours": [0] * 24}
+    assert v1["chrome.exe"] == {"total": 30, "hours": [0] * 24}
+
+    v2 = usage_store._load_day(DAY_V2)
+    hours = [0] * 24
+    hours[9] = 60
+    hours[23] = 30
+    assert v2["code.exe"] == {"total": 90, "hours": hours}
+
+
+def test_get_usage_range_reads_migrated_days(usage_store):
+    """迁移后的旧数据可以按日期范围读回"""
+    _write_legacy_file(usage_store)
+
+    assert usage_store.get_usage_range(DAY_V1, DAY_V2) == {
+        DAY_V1: {"code.exe": 120, "chrome.exe": 30},
+        DAY_V2: {"code.exe": 90},
+    }
+    assert usage_store.get_usage_range(DAY_V2, DAY_V3) == {DAY_V2: {"code.exe": 90}}
+    assert usage_store.get_usage_range("2023-12-01", "2023-12-31") == {}
@@ -0,0 +1,159 @@
+"""
+local_todo 提醒逻辑的回归测试
+"""
+import json
+import sqlite3
+import sys
+import time
+import types
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import local_todo  # noqa: E402
+
+
+@pytest.fixture
+def todo_store(tmp_path, monkeypatch):
+    """使用临时目录中的数据库，测试结束后恢复模块状态"""
+    monkeypatch.setattr(local_todo, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(local_todo, "DB_FILE", tmp_path / "todos.sqlite")
+    monkeypatch.setattr(local_todo, "TODOS_FILE", tmp_path / "todos.json")
+    monkeypatch.setattr(local_todo, "_conn", None)
+    monkeypatch.setattr(local_todo, "_snapshot", dict(local_todo._snapshot, key=None))
+    yield local_todo
+    if local_todo._conn is not None:
+        local_todo._conn.close()
+
+
+def test_legacy_remind_at_is_reminded_once(todo_store):
+    """只有 remind_at 字段（没有 reminded）的旧数据提醒一次后不再触发"""
+    remind_at = (datetime.now() - timedelta(minutes=5)).isoformat()
+    todo = todo_store.add_todo("旧格式提醒")
+    todo = dict(todo, remind_at=remind_at)
+    todo.pop("reminded", None)
+    with todo_store._lock:
+        todo_store._replace_todos(todo_store._refresh(), {todo["id"]: todo})
+
+    pending = todo_store.get_pending_reminders()
+    assert [t["id"] for t in pending] == [todo["id"]]
+
+    todo_store.mark_reminded_bulk([todo["id"]])
+
+    reminded = todo_store.get_todo(todo["id"])
+    assert reminded["reminded"] is True
+    assert todo_store.get_pending_reminders() == []
+
+    now = datetime.now()
+    assert todo_store._compute_next_fire(reminded, now) is None
+    assert todo_store._build_reminder_heap(todo_store._load_snapshot(), now) == []
+
+
+def test_legacy_remind_at_with_last_reminded_at_not_due(todo_store):
+    """last_reminded_at 不早于 remind_at 时视为已提醒"""
+    now = datetime.now()
+    todo = {
+        "remind_at": (now - timedelta(minutes=5)).isoformat(),
+        "last_reminded_at": (now - timedelta(minutes=1)).isoformat(),
+    }
+    assert todo_store._compute_next_fire(todo, now) is None
+    assert not todo_store._should_remind(todo, now)
+
+
+def test_legacy_import_without_remind_tag_sends_qq(todo_store, monkeypatch):
+    """旧 todos.json 中没有 remind_tag 的任务，到期后仍发送 QQ 提醒到默认 tag"""
+    sent = []
+    fake_qq = types.ModuleType("qq_notify")
+    fake_qq.send_notify = lambda tag, message: sent.append((tag, message)) or True
+    monkeypatch.setitem(sys.modules, "qq_notify", fake_qq)
+    monkeypatch.setattr(todo_store, "show_windows_notification", lambda title, message: None)
+
+    remind_at = (datetime.now() - timedelta(minutes=1)).isoformat()
+    todo_store.TODOS_FILE.write_text(json.dumps({
+        "todos": [{"id": "legacy1", "title": "旧任务", "remind_at": remind_at, "created_at": remind_at}],
+        "version": 1,
+    }), encoding="utf-8")
+
+    assert todo_store.get_todo("legacy1")["remind_tag"] == todo_store.DEFAULT_REMIND_TAG
+
+    todo_store.start_reminder_checker()
+    try:
+        deadline = time.time() + 5
+        while not sent and time.time() < deadline:
+            time.sleep(0.05)
+    finally:
+        todo_store.stop_reminder_checker()
+        todo_store._reminder_thread.join(5)
+
+    assert sent == [(todo_store.DEFAULT_REMIND_TAG, "📋 任务提醒：旧任务")]
+
+
+def _write_legacy_file(store, todos):
+    store.TODOS_FILE.write_text(json.dumps({"todos": todos, "version": 1}), encoding="utf-8")
+
+
+def _reopen(store, monkeypatch):
+    """关闭连接并清空快照，模拟进程重启"""
+    store._conn.close()
+    monkeypatch.setattr(store, "_conn", None)
+    monkeypatch.setattr(store, "_snapshot", dict(store._snapshot, key=None))
+
+
+def test_legacy_import_runs_once(todo_store, monkeypatch):
+    """todos.json 只在数据库首次创建时导入一次，文件本身保持不变"""
+    legacy = [
+        {"id": "a", "title": "旧任务 A", "important": True, "created_at": "2024-01-01T00:00:00"},
+        {"id": "b", "title": "旧任务 B", "completed": True, "created_at": "2024-01-02T00:00:00"},
+        {"title": "没有 id，跳过"},
+    ]
+    _write_legacy_file(todo_store, legacy)
+    raw = todo_store.TODOS_FILE.read_bytes()
+
+    assert [t["id"] for t in todo_store.get_todos(include_completed=True)] == ["a", "b"]
+    assert todo_store._get_conn().execute("PRAGMA user_version").fetchone()[0] == todo_store._MIGRATED_VERSION
+    assert todo_store.TODOS_FILE.read_bytes() == raw
+
+    # 删除全部任务并重新打开：不会再次导入
+    todo_store.delete_todo("a")
+    todo_store.delete_todo("b")
+    _reopen(todo_store, monkeypatch)
+    assert todo_store.get_todos(include_completed=True) == []
+
+    # 已迁移的数据库也不会导入后来出现的 todos.json
+    _write_legacy_file(todo_store, [{"id": "c", "title": "新文件", "created_at": "2024-01-03T00:00:00"}])
+    _reopen(todo_store, monkeypatch)
+    assert todo_store.get_todos(include_completed=True) == []
+
+
+def test_snapshot_refreshes_after_write_from_other_connection(todo_store):
+    """其它连接（如 MCP Server 进程）提交后，快照通过 data_version 失效并重新加载"""
+    todo = todo_store.add_todo("本进程")
+    assert [t["title"] for t in todo_store.get_todos()] == ["本进程"]
+
+    other = sqlite3.connect(todo_store.DB_FILE)
+    try:
+        with other:
+            other.execute("UPDATE todos SET title = ? WHERE id = ?", ("其它进程改名", todo["id"]))
+    finally:
+        other.close()
+
+    assert [t["title"] for t in todo_store.get_todos()] == ["其它进程改名"]
+    assert todo_store.get_todo(todo["id"])["title"] == "其它进程改名"
+
+
+def test_delete_parent_removes_subtree(todo_store):
+    """删除父任务时一并删除所有子孙任务，其它任务不受影响"""
+    parent = todo_store.add_todo("父任务")
+    child = todo_store.add_todo("子任务", parent_id=parent["id"])
+    todo_store.add_todo("孙任务", parent_id=child["id"])
+    other = todo_store.add_todo("无关任务")
+
+    assert todo_store.delete_todo(parent["id"]) is True
+    assert [t["id"] for t in todo_store.get_todos(include_completed=True)] == [other["id"]]
+
+    rows = todo_store._get_conn().execute("SELECT id FROM todos").fetchall()
+    assert rows == [(other["id"],)]
+    assert todo_store.delete_todo(parent["id"]) is False